@@ -2,8 +2,12 @@
 
 import streamlit as st
 import json
+import time
 from pathlib import Path
 from utils import load_from_drive, backup_to_drive, secure_filename
+from patent_core.compact_state import summary_to_dict
+from patent_core.catalog import open_catalog
+from session import get_history, load_session_summary, redo_summary, save_session_summary, undo_summary
 
 # Set Streamlit page config
 st.set_page_config(page_title="Patent Summary Tool", layout="wide")
@@ -14,7 +18,62 @@ st.info("Navigate through the pages in the sidebar to edit claims, extract featu
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
-# File input (no longer listing everything)
+# Max. applications listed by the picker; the filters narrow down the rest
+PICKER_LIMIT = 200
+
+# Catalog of all applications, updated on every save (data/ itself is only scanned once)
+catalog = open_catalog(DATA_DIR)
+if not catalog.path.exists():
+    with st.spinner("📂 Building the application catalog (only needed once)..."):
+        catalog.rescan()
+
+# --- Portfolio dashboard ---
+with st.expander("📊 Portfolio overview"):
+    stats = catalog.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Applications", stats["applications"])
+    col2.metric("Claims", stats["claims"], help=f"{stats['avg_claims']:.1f} per application")
+    col3.metric("Features", stats["features"], help=f"{stats['avg_features']:.1f} per application")
+    col4.metric("Network nodes / edges", f"{stats['nodes']} / {stats['edges']}")
+    col5, col6 = st.columns(2)
+    col5.metric("Word documents", f"{stats['docx']} of {stats['applications']}")
+    col6.metric("Synced to Google Drive", f"{stats['synced']} of {stats['applications']}")
+    if stats["years"]:
+        st.bar_chart(stats["years"])
+    if st.button("🔄 Rescan data folder", help="Only needed for folders copied into data/ by hand"):
+        st.success(f"✅ {catalog.rescan()} catalog entries updated.")
+
+# --- Application picker ---
+with st.expander("📂 Open an existing application"):
+    query = st.text_input("Filter by name", key="picker_query", placeholder="e.g., EP12")
+    col1, col2 = st.columns(2)
+    docx_filter = col1.selectbox("Word document", ["Any", "Created", "Missing"], key="picker_docx")
+    sync_filter = col2.selectbox("Google Drive", ["Any", "Synced", "Never synced"], key="picker_sync")
+    matches = catalog.search(
+        query,
+        docx={"Any": None, "Created": True, "Missing": False}[docx_filter],
+        synced={"Any": None, "Synced": True, "Never synced": False}[sync_filter]
+    )
+    st.caption(f"{len(matches)} applications match" + (f", showing the first {PICKER_LIMIT}" if len(matches) > PICKER_LIMIT else ""))
+    st.dataframe([
+        {
+            "Application": name,
+            "Date": entry["date"],
+            "Claims": entry["claims"],
+            "Features": entry["features"],
+            "Nodes": entry["nodes"],
+            "Edges": entry["edges"],
+            "Word": "✅" if entry["docx"] else "",
+            "Drive sync": time.strftime("%d-%m-%Y %H:%M", time.localtime(entry["drive_sync"])) if entry.get("drive_sync") else ""
+        }
+        for name, entry in matches[:PICKER_LIMIT]
+    ], hide_index=True, use_container_width=True)
+    picked = st.selectbox("Application", [name for name, _ in matches[:PICKER_LIMIT]], index=None, key="picker_choice")
+    if st.button("📂 Open", disabled=picked is None, use_container_width=True):
+        st.session_state["filename"] = picked
+        st.rerun()
+
+# File input (the picker above lists what already exists)
 current_filename = st.session_state.get("filename", None)
 raw_input = st.text_input("Enter a new filename or reuse session one:", value=current_filename or "", placeholder="e.g., EP1234567")
 
@@ -27,31 +86,45 @@ st.session_state["filename"] = filename
 summary_path = DATA_DIR / filename / f"Summary_{filename}.json"
 (DATA_DIR / filename).mkdir(parents=True, exist_ok=True)
 
-# Load local file
+# Load local file (only re-parsed when it changed since this session read or saved it)
 if summary_path.exists():
     try:
-        with open(summary_path, "r", encoding="utf-8") as f:
-            st.session_state["summary_data"] = json.load(f)
+        load_session_summary(summary_path)
     except Exception as e:
         st.warning(f"⚠️ Failed to load local JSON file: {e}")
         st.session_state["summary_data"] = {}
+        st.session_state.pop("summary_base", None)
 else:
     st.session_state["summary_data"] = {}
+    st.session_state.pop("summary_base", None)
 
 # Load from Google Drive
 if st.button("☁️ Load from Google Drive", use_container_width=True):
     try:
         data = load_from_drive(filename)
-        st.session_state["summary_data"] = data
-        with open(summary_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        if save_session_summary(summary_path, data, force=True, label="Load from Google Drive"):
+            catalog.mark_drive_sync(filename)
         st.success("✅ Loaded data from Google Drive.")
     except Exception as e:
         st.error(f"❌ Failed to load from Drive: {e}")
 
+# Undo / Redo (history is stored next to the summary and shared by all sessions)
+history = get_history(summary_path)
+col_undo, col_redo = st.columns(2)
+with col_undo:
+    undo_label = history.undo_label()
+    if st.button(f"↩️ Undo {undo_label or ''}".strip(), disabled=not history.can_undo, key="undo_summary", use_container_width=True):
+        if undo_summary(summary_path):
+            st.rerun()
+with col_redo:
+    redo_label = history.redo_label()
+    if st.button(f"↪️ Redo {redo_label or ''}".strip(), disabled=not history.can_redo, key="redo_summary", use_container_width=True):
+        if redo_summary(summary_path):
+            st.rerun()
+
 # Download
 if st.session_state.get("summary_data"):
-    json_str = json.dumps(st.session_state["summary_data"], indent=4, ensure_ascii=False)
+    json_str = json.dumps(summary_to_dict(st.session_state["summary_data"]), indent=4, ensure_ascii=False)
     st.download_button(
         label="📥 Download Summary JSON",
         data=json_str,
@@ -63,7 +136,8 @@ if st.session_state.get("summary_data"):
 # Backup to Drive
 if st.button("📤 Backup to Google Drive", use_container_width=True):
     try:
-        backup_to_drive(filename, st.session_state["summary_data"])
+        backup_to_drive(filename, summary_to_dict(st.session_state["summary_data"]))
+        catalog.mark_drive_sync(filename)
         st.success("✅ Backup completed to Google Drive.")
     except Exception as e:
         st.error(f"❌ Failed to upload to Drive: {e}")
\ No newline at end of file
@@ -0,0 +1,93 @@
+# benchmarks/session_memory.py
+#
+# Per-session footprint of summary_data + the graph in session state,
+# plain JSON dict + nx.DiGraph versus CompactSummary + CompactGraph.
+#
+#   python benchmarks/session_memory.py --claims 120 --features 40
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import networkx as nx
+from patent_core.compact_state import CompactGraph, compact_summary, summary_to_dict
+
+
+def synthetic_summary(num_claims, num_features):
+    feature_table, edited = {}, {}
+    for c in range(num_claims):
+        terms = [f"a feature member {c * 3 + f}" for f in range(num_features)]
+        terms += [f"the feature member {c * 3 + f}" for f in range(num_features // 2)]
+        feature_table[f"Cl_{c+1}"] = terms
+        edited[f"Cl_{c+1}"] = [t for t in terms if not t.startswith("the ")]
+
+    flat = {"a_list": [], "prep_list": [], "the_list": [], "Cl_nr": []}
+    for label, terms in edited.items():
+        for term in terms:
+            flat["a_list"].append(term)
+            flat["prep_list"].append("")
+            flat["the_list"].append("")
+            flat["Cl_nr"].append(label)
+
+    nodes = list(dict.fromkeys(flat["a_list"]))
+    edges = [(nodes[i], nodes[i + 2]) for i in range(len(nodes) - 2)]
+    return {
+        "User Entered Claims": {label: f"{label[3:]}. A claim text." for label in edited},
+        "Feature Table": feature_table,
+        "Edited Feature Table": edited,
+        "Concatenated DataFrame": flat,
+        "Network": {
+            "nodes": [{"id": n, "color": "red"} for n in nodes],
+            "edges": [{"source": u, "target": v, "label": ""} for u, v in edges]
+        }
+    }
+
+
+def networkx_graph(network_data):
+    G = nx.DiGraph()
+    for node in network_data["nodes"]:
+        G.add_node(node["id"], color=node["color"])
+    for edge in network_data["edges"]:
+        G.add_edge(edge["source"], edge["target"], label=edge["label"])
+    return G
+
+
+def measure(build, json_str):
+    gc.collect()
+    tracemalloc.start()
+    state = build(json_str)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, state
+
+
+def before(json_str):
+    data = json.loads(json_str)
+    return data, networkx_graph(data["Network"])
+
+
+def after(json_str):
+    data = compact_summary(json.loads(json_str))
+    return data, CompactGraph.from_network_data(data["Network"], data.pool)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--claims", type=int, default=120)
+    parser.add_argument("--features", type=int, default=40)
+    args = parser.parse_args()
+
+    json_str = json.dumps(synthetic_summary(args.claims, args.features))
+    plain_size, (plain, _) = measure(before, json_str)
+    compact_size, (compact, _) = measure(after, json_str)
+    assert summary_to_dict(compact) == plain
+
+    print(f"Summary JSON:      {len(json_str) / 1024:9.1f} KiB")
+    print(f"dict + DiGraph:    {plain_size / 1024:9.1f} KiB")
+    print(f"Compact:           {compact_size / 1024:9.1f} KiB")
+    print(f"Reduction:         {100 * (1 - compact_size / plain_size):9.1f} %")
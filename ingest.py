@@ -0,0 +1,198 @@
+# ingest.py
+
+import argparse
+import re
+import xml.etree.ElementTree as ET
+import sys
+from pathlib import Path
+from patent_core.catalog import open_catalog, summary_entry
+from patent_core.paths import secure_filename
+from patent_core.storage import save_summary
+
+DATA_DIR = Path("data")
+# Catalog entries are appended as one frame per this many written summaries
+CATALOG_BATCH = 1000
+
+# A publication number alone on a line starts a new application in text dumps,
+# e.g. "EP1234567", "EP 1 234 567 A1" or "# WO2020123456".
+_PUBLICATION_LINE = re.compile(r"^\s*#*\s*([A-Z]{2}\s?\d[\d ]*(?:\s?[A-Z]\d?)?)\s*$")
+_CLAIM_START = re.compile(r"^\s*\d+\s*\.")
+
+
+# --- Text dumps (claims_test.txt format) ---
+def _claims_from_lines(lines):
+    claims, current = [], []
+    for line in lines:
+        if not line.strip() or _CLAIM_START.match(line):
+            if current:
+                claims.append(" ".join(current))
+                current = []
+        if line.strip():
+            current.append(" ".join(line.split()))
+    if current:
+        claims.append(" ".join(current))
+    return claims
+
+
+def iter_text_applications(stream, publication=None):
+    # Only the claims of the application being read are held in memory.
+    # Claims before the first header line (or a file without any, like
+    # claims_test.txt) belong to `publication`.
+    lines = []
+    for line in stream:
+        header = _PUBLICATION_LINE.match(line)
+        if header:
+            claims = _claims_from_lines(lines)
+            if publication and claims:
+                yield publication, claims
+            publication, lines = "".join(header.group(1).split()), []
+        elif publication:
+            lines.append(line)
+    claims = _claims_from_lines(lines)
+    if publication and claims:
+        yield publication, claims
+
+
+# --- XML dumps (EP-style, one or more concatenated documents) ---
+def _publication_number(elem):
+    number = elem.get("id") or ""
+    if not number and elem.get("doc-number"):
+        number = f"{elem.get('country', '')}{elem.get('doc-number')}{elem.get('kind', '')}"
+    return number
+
+
+# Character-level markup inside a claim; any other element (nested <claim-text>) is a separate clause
+_INLINE_TAGS = {"b", "i", "u", "sub", "sup", "smallcaps", "o"}
+
+
+def _text_parts(elem):
+    # Inline markup must not add spaces: "CO<sub>2</sub>" -> "CO2", "a <b>lever</b>." -> "a lever."
+    # while "comprising:<claim-text>a housing" keeps its clauses apart
+    yield elem.text or ""
+    for child in elem:
+        sep = "" if child.tag.rsplit("}", 1)[-1] in _INLINE_TAGS else " "
+        yield sep
+        yield from _text_parts(child)
+        yield sep
+        yield child.tail or ""
+
+
+def _claim_text(elem, position):
+    text = " ".join("".join(_text_parts(elem)).split())
+    num = elem.get("num", "").lstrip("0") or str(position)
+    if not _CLAIM_START.match(text):
+        text = f"{num}. {text}"
+    return text
+
+
+def iter_xml_applications(stream):
+    # XMLPullParser is fed line by line and every finished document is cleared,
+    # so memory stays flat over concatenated <?xml ...?> documents.
+    parser, depth = None, 0
+    publication, claims, in_claims = None, [], False
+
+    def events(chunk):
+        nonlocal depth, publication, claims, in_claims
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    publication, claims = _publication_number(elem), []
+                elif tag == "claims":
+                    # Only the first (procedural language) claim set is kept
+                    in_claims = not claims
+                continue
+            depth -= 1
+            if tag == "claim" and in_claims:
+                claims.append(_claim_text(elem, len(claims) + 1))
+                elem.clear()
+            elif tag == "claims":
+                in_claims = False
+                elem.clear()
+            elif depth == 1 and tag in {"description", "drawings", "abstract", "search-report-data"}:
+                elem.clear()
+            elif depth == 0:
+                elem.clear()
+                if publication and claims:
+                    yield publication, claims
+
+    for line in stream:
+        if line.lstrip().startswith("<?xml") and parser is not None:
+            parser.close()
+            parser, depth = None, 0
+        if parser is None:
+            parser = ET.XMLPullParser(events=("start", "end"))
+        yield from events(line)
+    if parser is not None:
+        parser.close()
+
+
+# --- Writing skeletons ---
+def write_summary_skeleton(publication, claims, data_dir=DATA_DIR, overwrite=False):
+    filename = secure_filename(publication)
+    json_path = Path(data_dir) / filename / f"Summary_{filename}.json"
+    if json_path.exists() and not overwrite:
+        return None
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = {
+        "Nr. Claims": str(len(claims)),
+        "User Entered Claims": {f"Cl_{i+1}": claim for i, claim in enumerate(claims)},
+    }
+    saved, _ = save_summary(json_path, data, force=True)
+    return json_path, saved
+
+
+def _record_entries(data_dir, entries):
+    try:
+        open_catalog(data_dir).record_entries(entries)
+    except Exception as e:
+        # The summaries are written; '🔄 Rescan data folder' on the main page picks them up
+        print(f"⚠️ Catalog not updated: {e}", file=sys.stderr)
+
+
+def ingest_dump(path, data_dir=DATA_DIR, overwrite=False, publication=None):
+    # Text claims without a publication-number header are stored under `publication`, or the file name
+    path = Path(path)
+    is_xml = path.suffix.lower() == ".xml"
+    written, skipped, entries = 0, 0, {}
+    with open(path, "r", encoding="utf-8", errors="replace") as stream:
+        if is_xml:
+            applications = iter_xml_applications(stream)
+        else:
+            applications = iter_text_applications(stream, publication or path.stem)
+        for publication, claims in applications:
+            result = write_summary_skeleton(publication, claims, data_dir, overwrite)
+            if result is None:
+                skipped += 1
+                continue
+            written += 1
+            json_path, saved = result
+            entries[json_path.parent.name] = summary_entry(json_path, saved)
+            if len(entries) >= CATALOG_BATCH:
+                _record_entries(data_dir, entries)
+                entries = {}
+    if entries:
+        _record_entries(data_dir, entries)
+    return written, skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split a bulk claims dump into per-application summaries.")
+    parser.add_argument(
+        "dump",
+        help="EP-style XML, or a claims text file in which a line holding only a publication number "
+             "(e.g. 'EP1234567') starts each application"
+    )
+    parser.add_argument("--data-dir", default=str(DATA_DIR))
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing summaries")
+    parser.add_argument(
+        "--publication",
+        help="Application for text claims before the first publication-number line (default: the file name)"
+    )
+    args = parser.parse_args()
+
+    written, skipped = ingest_dump(args.dump, args.data_dir, args.overwrite, args.publication)
+    print(f"✅ {written} summaries written, {skipped} existing skipped.")
@@ -2,8 +2,8 @@ import streamlit as st
 from pathlib import Path
 from PIL import Image
 from datetime import datetime
-import json
 from utils import secure_filename 
+from session import save_session_summary
 
 # Configure Streamlit
 st.set_page_config(layout="wide")
@@ -76,11 +76,10 @@ with col_image:
 
 # --- Save Button ---
 def save_to_local():
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    return save_session_summary(json_path, data, label="General")
 
 if st.button("💾 Save Locally", type="primary", use_container_width=True):
     data["Date"] = datetime.now().strftime("%d-%m-%Y")
     st.session_state["summary_data"] = data
-    save_to_local()
-    st.success(f"Data saved locally to {json_path}")
\ No newline at end of file
+    if save_to_local():
+        st.success(f"Data saved locally to {json_path}")
\ No newline at end of file
@@ -1,15 +1,14 @@
 import streamlit as st
-import re
-import spacy
 import pandas as pd
 from pathlib import Path
-import json
 from utils import secure_filename 
+from session import save_session_summary
+from patent_core import extract
 
 # --- Caching NLP model ---
 @st.cache_resource
 def get_nlp():
-    return spacy.load("en_core_web_sm")
+    return extract.load_nlp()
 
 nlp = get_nlp()
 
@@ -24,6 +23,10 @@ json_path = Path(f"data/{filename}/Summary_{filename}.json")
 Path(f"data/{filename}").mkdir(parents=True, exist_ok=True)
 st.title(f"Automatic Features Extraction for {filename}")
 
+CLAIMS_PER_PAGE = 10
+# st.cache_data is shared by all sessions of the server: keep the most recent claim sets only
+CACHED_CLAIM_SETS = 32
+
 # --- Claims text area ---
 initial_claims_text = "\n".join(data.get("User Entered Claims", {}).values())
 claims_text = st.text_area(
@@ -35,62 +38,63 @@ claims_text = st.text_area(
 )
 
 # --- Utility functions ---
-def remove_parenthesized_text(claim):
-    cleaned = re.sub(r'\([^)]*\)', '', claim)
-    return re.sub(r'\s+', ' ', cleaned).strip()
-
-def extract_noun_chunks(claim):
-    doc = nlp(claim)
-    chunks = []
-    for chunk in doc.noun_chunks:
-        words = chunk.text.split()
-        if doc[chunk.start].pos_ == "DET" and doc[chunk.start].text.lower() not in {"a", "an", "the"}:
-            words = words[1:]
-        for i, word in enumerate(words):
-            if word.lower() in {"for", "with", "by", "of", "on", "at"}:
-                words = words[:i]
-                break
-        noun_phrase = " ".join(words).strip()
-        if noun_phrase and len(noun_phrase.split()) > 1:
-            chunks.append(noun_phrase)
-
-    words = claim.split()
-    for i in range(len(words) - 1):
-        if words[i].lower() in {"a", "an", "the"} and words[i+1].isalpha():
-            chunks.insert(0, f"{words[i]} {words[i+1]}")
-            break
-    return chunks
-
-def apply_highlighting(claim, chunks):
-    highlighted = claim
-    for chunk in chunks:
-        highlighted = re.sub(rf'\b{re.escape(chunk)}\b', f'<b style="color:red;">{chunk}</b>', highlighted)
-    return highlighted
-
-def create_feature_table(features, num_claims):
-    filtered = {
-        k: [term for term in v if not term.lower().startswith(("the ", "said "))]
-        for k, v in features.items()
-    }
-    df = pd.DataFrame.from_dict(filtered, orient="index").T
-    df.columns = [f"Cl_{i+1}" for i in range(num_claims)]
-    df.index = [f"Feature {i+1}" for i in range(df.shape[0])]
-    st.markdown(df.to_html(escape=False), unsafe_allow_html=True)
+@st.cache_data(show_spinner="Extracting features...", max_entries=CACHED_CLAIM_SETS)
+def extract_all_features(cleaned_claims):
+    return extract.extract_features(cleaned_claims, nlp)
+
+@st.cache_data(show_spinner=False, max_entries=CACHED_CLAIM_SETS)
+def create_feature_table(features, num_claims, similarity=None):
+    # Mentions are grouped by spaCy lemma, so "a gas" and "the gases" are one feature
+    return extract.create_feature_table(features, num_claims, similarity, nlp)
+
+@st.cache_data(show_spinner=False, max_entries=4 * CACHED_CLAIM_SETS)
+def feature_table_html(features, num_claims, page, similarity=None):
+    df = create_feature_table(features, num_claims, similarity)
+    return df.iloc[:, page * CLAIMS_PER_PAGE:(page + 1) * CLAIMS_PER_PAGE].to_html(escape=False)
+
+def page_frame(table, columns):
+    num_rows = max((len(table[col]) for col in columns), default=0)
+    df = pd.DataFrame(
+        {col: table[col] + [None] * (num_rows - len(table[col])) for col in columns},
+        dtype=object
+    )
+    df.index = [f"Feature {i+1}" for i in range(num_rows)]
     return df
 
+def apply_feature_edits(editor_key, columns):
+    # Apply only the changed cells to the stored edited table
+    delta = st.session_state[editor_key]
+    table = st.session_state["edited_feature_table"]["table"]
+
+    for row, changes in delta.get("edited_rows", {}).items():
+        row = int(row)
+        for col, value in changes.items():
+            if col in table:
+                table[col] += [None] * (row + 1 - len(table[col]))
+                table[col][row] = value
+    for row in sorted(delta.get("deleted_rows", []), reverse=True):
+        for col in columns:
+            if row < len(table[col]):
+                del table[col][row]
+    for added in delta.get("added_rows", []):
+        num_rows = max(len(table[col]) for col in columns)
+        for col in columns:
+            if col in added:
+                table[col] += [None] * (num_rows - len(table[col]))
+                table[col].append(added[col])
+
 def save_to_local():
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    return save_session_summary(json_path, data, label="Extract Features")
 
 # --- Main logic ---
 if claims_text:
-    claims_list = [claim.strip() for claim in claims_text.split("\n") if claim.strip()]
-    cleaned_claims = [remove_parenthesized_text(claim) for claim in claims_list]
+    cleaned_claims = extract.split_claims(claims_text)
+    num_claims = len(cleaned_claims)
 
-    extracted_features = {i: extract_noun_chunks(claim) for i, claim in enumerate(cleaned_claims)}
+    extracted_features = extract_all_features(tuple(cleaned_claims))
 
     highlighted_claims = [
-        apply_highlighting(claim, extracted_features[i])
+        extract.apply_highlighting(claim, extracted_features[i])
         for i, claim in enumerate(cleaned_claims)
     ]
     formatted = "".join(f'<div style="margin-bottom: 10px;">{c}</div>' for c in highlighted_claims)
@@ -98,37 +102,44 @@ if claims_text:
     st.subheader("Automatically Highlighted Claims")
     st.markdown(formatted, unsafe_allow_html=True)
 
+    # Edited table is kept per extraction result; reuse the saved one if the claims are unchanged
+    user_claims = {f"Cl_{i+1}": claim for i, claim in enumerate(cleaned_claims)}
+    merge_similar = st.checkbox("Merge near-duplicate spellings of features", value=False)
+    similarity = extract.SIMILARITY_THRESHOLD if merge_similar else None
+    source = (filename, hash(tuple(cleaned_claims)), similarity)
+    previous = st.session_state.get("edited_feature_table", {}).get("source")
+    if previous != source:
+        # Toggling the merge checkbox always rebuilds; otherwise the saved edits win while the claims match
+        toggled = previous is not None and previous[:2] == source[:2]
+        if not toggled and data.get("User Entered Claims") == user_claims and data.get("Edited Feature Table"):
+            table = {col: list(values) for col, values in data["Edited Feature Table"].items()}
+        else:
+            feature_df = create_feature_table(extracted_features, num_claims, similarity)
+            table = extract.table_from_frame(feature_df)
+        st.session_state["edited_feature_table"] = {"source": source, "table": table}
+    edited_table = st.session_state["edited_feature_table"]["table"]
+
     st.subheader("Feature Table")
-    feature_df = create_feature_table(extracted_features, len(cleaned_claims))
-    edited_feature_df = st.data_editor(feature_df, num_rows="dynamic")
+    num_pages = -(-num_claims // CLAIMS_PER_PAGE)
+    page = 0
+    if num_pages > 1:
+        page = st.number_input(f"Claims page (of {num_pages})", min_value=1, max_value=num_pages, value=1) - 1
+    page_columns = list(edited_table)[page * CLAIMS_PER_PAGE:(page + 1) * CLAIMS_PER_PAGE]
+
+    st.markdown(feature_table_html(extracted_features, num_claims, page, similarity), unsafe_allow_html=True)
+    editor_key = f"feature_editor_{hash(source)}_{page}"
+    st.data_editor(
+        page_frame(edited_table, page_columns),
+        num_rows="dynamic",
+        key=editor_key,
+        on_change=apply_feature_edits,
+        args=(editor_key, page_columns)
+    )
 
     if st.button("💾 Save Locally", type="primary", use_container_width=True):
-        data["User Entered Claims"] = {f"Cl_{i+1}": claim for i, claim in enumerate(cleaned_claims)}
-        data["Feature Table"] = {f"Cl_{i+1}": extracted_features.get(i, []) for i in range(len(cleaned_claims))}
-        data["Edited Feature Table"] = {
-            f"Cl_{i+1}": edited_feature_df.iloc[:, i].dropna().tolist()
-            for i in range(edited_feature_df.shape[1])
-        }
-
-        # Build data for network graph
-        flat_data = {
-            "a_list": [],
-            "prep_list": [],
-            "the_list": [],
-            "Cl_nr": []
-        }
-
-        for col in edited_feature_df.columns:
-            claim_label = col
-            for val in edited_feature_df[col].dropna():
-                flat_data["a_list"].append(val)
-                flat_data["prep_list"].append("")   # editable later
-                flat_data["the_list"].append("")    # optional
-                flat_data["Cl_nr"].append(claim_label)
-
-        data["Concatenated DataFrame"] = flat_data
+        data.update(extract.extraction_sections(cleaned_claims, extracted_features, edited_table))
 
         # Save all to disk
         st.session_state["summary_data"] = data
-        save_to_local()
-        st.success(f"✅ Data saved locally to {json_path}")
\ No newline at end of file
+        if save_to_local():
+            st.success(f"✅ Data saved locally to {json_path}")
@@ -1,17 +1,13 @@
 import streamlit as st
-import networkx as nx
-import pandas as pd
 from pathlib import Path
-from itertools import cycle
 from pyvis.network import Network
 import tempfile
-import json
 from utils import secure_filename
-
-# Color cycle for claims
-COLORS = ["red", "orange", "lime", "turquoise", "hotpink", "khaki", "blue",
-          "green", "yellow", "violet", "coral", "pink", "steelblue",
-          "salmon", "tomato", "springgreen"] * 10
+from patent_core.compact_state import CompactGraph
+from session import save_session_summary
+from patent_core.reachability import ReachabilityIndex
+from patent_core.history import SummaryHistory, chunk_sections, join_chunks
+from patent_core.graph import COLORS, concatenated_dataframe, create_graph, graph_to_network_data
 
 # --- Session Checks ---
 if "filename" not in st.session_state:
@@ -27,67 +23,9 @@ st.title(f"Network Graph for {filename}")
 
 # --- Save Utility ---
 def save_to_local():
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    return save_session_summary(json_path, data, label="Network")
 
 # --- Utility Functions ---
-def concatatened_dataframe(df_data):
-    rows = []
-    a_list = df_data.get('a_list', [])
-    prep_list = df_data.get('prep_list', [])
-    the_list = df_data.get('the_list', [])
-    cl_nr_list = df_data.get('Cl_nr', [])
-    max_len = max(len(a_list), len(prep_list), len(the_list), len(cl_nr_list))
-
-    a_list += [''] * (max_len - len(a_list))
-    prep_list += [''] * (max_len - len(prep_list))
-    the_list += [''] * (max_len - len(the_list))
-    cl_nr_list += [''] * (max_len - len(cl_nr_list))
-
-    for i in range(max_len):
-        rows.append([i, a_list[i], prep_list[i], the_list[i], cl_nr_list[i]])
-
-    df = pd.DataFrame(rows, columns=['index', 'a_list', 'prep_list', 'the_list', 'Cl_nr'])
-    return df
-
-def create_graph(df):
-    G = nx.DiGraph()
-    color_cycle = cycle(COLORS)
-    node_colors = {}
-    claim_colors = {}
-
-    for _, row in df.iterrows():
-        node = row['a_list']
-        claim = row['Cl_nr']
-        if pd.notna(node) and node.strip():
-            if node not in node_colors:
-                if claim not in claim_colors:
-                    claim_colors[claim] = next(color_cycle)
-                node_colors[node] = claim_colors[claim]
-
-    for node, color in node_colors.items():
-        G.add_node(node, color=color)
-
-    for i in range(len(df) - 2):
-        node_a, node_b = None, None
-        edge_label = df.at[i + 1, 'prep_list'] if pd.notna(df.at[i + 1, 'prep_list']) else ""
-
-        if pd.notna(df.at[i, 'a_list']) and df.at[i, 'a_list'].strip():
-            if pd.isna(df.at[i + 2, 'the_list']) or not df.at[i + 2, 'the_list'].strip():
-                if pd.notna(df.at[i + 2, 'a_list']) and df.at[i + 2, 'a_list'].strip():
-                    node_a = df.at[i, 'a_list']
-                    node_b = df.at[i + 2, 'a_list']
-        elif pd.notna(df.at[i, 'the_list']) and df.at[i, 'the_list'].strip():
-            if pd.notna(df.at[i + 2, 'a_list']) and df.at[i + 2, 'a_list'].strip():
-                node_a = next((n for n in df['a_list'] if n == df.at[i, 'the_list']), None)
-                node_b = df.at[i + 2, 'a_list']
-
-        if node_a and node_b:
-            G.add_edge(node_a, node_b, label=edge_label)
-
-    nx.set_node_attributes(G, {node: 0 for node in G.nodes}, "subset")
-    return G
-
 def display_pyvis_graph(G):
     net = Network(notebook=False)
     for node, attrs in G.nodes(data=True):
@@ -96,6 +34,22 @@ def display_pyvis_graph(G):
         net.add_edge(str(edge[0]), str(edge[1]), title=edge[2].get("label", ""))
     return net
 
+def commit_graph(G, label):
+    # Store the edited graph in session and record it for Undo/Redo; nodes and edges are
+    # recorded in chunks so an edit only stores the chunks it changed
+    compact = CompactGraph.from_networkx(G)
+    st.session_state["G"] = compact
+    network_data = compact.to_network_data()
+    st.session_state["graph_history"].record(label, {
+        **chunk_sections("nodes", network_data["nodes"], lambda node: node["id"]),
+        **chunk_sections("edges", network_data["edges"], lambda edge: f"{edge['source']}\0{edge['target']}")
+    })
+
+def restore_graph(state):
+    network_data = {"nodes": join_chunks(state, "nodes"), "edges": join_chunks(state, "edges")}
+    st.session_state["G"] = CompactGraph.from_network_data(network_data)
+    st.session_state["reach_index"] = ReachabilityIndex.from_network_data(network_data)
+
 def display_color_legend(num_claims):
     st.subheader("Claim Color Legend")
     for i in range(num_claims):
@@ -111,11 +65,20 @@ if not network_features or not any(network_features.values()):
     st.warning("⚠️ No network data found. Please extract features first in '2_Extract Features' and save them.")
     st.stop()
 
-df = concatatened_dataframe(network_features)
+df = concatenated_dataframe(network_features)
 display_color_legend(len(set(df["Cl_nr"])))
 
-G = create_graph(df)
-st.session_state["G"] = G
+# The edited graph and its reachability index live in session until the features change
+graph_source = (filename, hash(tuple(tuple(values) for values in network_features.values())))
+if st.session_state.get("G_source") != graph_source or "G" not in st.session_state:
+    G = create_graph(df)
+    st.session_state["graph_history"] = SummaryHistory()
+    commit_graph(G, "Build")
+    st.session_state["G_source"] = graph_source
+    st.session_state["reach_index"] = ReachabilityIndex.from_graph(G)
+else:
+    G = st.session_state["G"].to_networkx()
+reach_index = st.session_state["reach_index"]
 
 net = display_pyvis_graph(G)
 with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".html", encoding="utf-8") as tmp_file:
@@ -141,12 +104,14 @@ with col2:
 if add_node_submit and new_node:
     if new_node not in G.nodes:
         G.add_node(new_node, color="yellow")
-        st.session_state["G"] = G
+        reach_index.add_node(new_node)
+        commit_graph(G, "Add Node")
         st.rerun()
 
 if del_node_submit and node_to_delete:
     G.remove_node(node_to_delete)
-    st.session_state["G"] = G
+    reach_index.remove_node(node_to_delete)
+    commit_graph(G, "Del Node")
     st.rerun()
 
 col3, col4 = st.columns([3, 1])
@@ -165,22 +130,34 @@ with col4:
 
 if add_edge_submit and edge_node1 and edge_node2:
     G.add_edge(edge_node1, edge_node2, label=edge_label)
-    st.session_state["G"] = G
+    reach_index.add_edge(edge_node1, edge_node2)
+    commit_graph(G, "Add Edge")
     st.rerun()
 
 if del_edge_submit and edge_to_delete:
     u, v = edge_to_delete.split(" -> ")
     G.remove_edge(u, v)
-    st.session_state["G"] = G
+    reach_index.remove_edge(u, v)
+    commit_graph(G, "Del Edge")
     st.rerun()
 
+# --- Undo / Redo of graph edits ---
+graph_history = st.session_state["graph_history"]
+col5, col6 = st.columns(2)
+with col5:
+    if st.button(f"↩️ Undo {graph_history.undo_label() or ''}".strip(), disabled=not graph_history.can_undo,
+                 key="undo_graph", use_container_width=True):
+        restore_graph(graph_history.undo())
+        st.rerun()
+with col6:
+    if st.button(f"↪️ Redo {graph_history.redo_label() or ''}".strip(), disabled=not graph_history.can_redo,
+                 key="redo_graph", use_container_width=True):
+        restore_graph(graph_history.redo())
+        st.rerun()
+
 # --- Final Save Button ---
 if st.button("💾 Save Graph Locally", type="primary", use_container_width=True):
-    network_data = {
-        "nodes": [{"id": node, "color": G.nodes[node].get("color", "lightblue")} for node in G.nodes],
-        "edges": [{"source": u, "target": v, "label": G.edges[u, v].get("label", "")} for u, v in G.edges]
-    }
-    data["Network"] = network_data
+    data["Network"] = graph_to_network_data(G)
     st.session_state["summary_data"] = data
-    save_to_local()
-    st.success(f"✅ Graph saved locally to {json_path}")
\ No newline at end of file
+    if save_to_local():
+        st.success(f"✅ Graph saved locally to {json_path}")
\ No newline at end of file
@@ -1,6 +1,6 @@
 import streamlit as st
-import re
 from utils import secure_filename 
+from patent_core.cite import cit_claim
 
 # --- Session Checks ---
 if "filename" not in st.session_state:
@@ -24,26 +24,8 @@ if not cl_1_list:
     st.warning("⚠️ No extracted features for Claim 1. Please process claims in '2_Extract Features'.")
     st.stop()
 
-# --- Citation Injection Function ---
-def cit_claim(comm_text):
-    pattern = r'\b(' + '|'.join(map(re.escape, cl_1_list)) + r')\b'
-
-    def replacement(match):
-        matched_text = match.group(0)
-        citation = " (D1: abstr., fig., page )"
-        match_end = match.end()
-        if match_end < len(comm_text) and comm_text[match_end] in ".,;:":
-            return f"{matched_text}{citation}"
-        return f"{matched_text}{citation}"
-
-    updated_text = re.sub(pattern, replacement, comm_text, count=0)
-    updated_text = re.sub(r"^[^a-zA-Z]+", "", updated_text)
-    updated_text = re.sub(r"\)([.,;:]?)", r")\1\n", updated_text)
-    updated_text = re.sub(r"([.,;:]) (\b(?:a|an)\b )", r"\1\n\2", updated_text)
-    return updated_text
-
 # --- Display Output ---
-edited_text = cit_claim(comm_text)
+edited_text = cit_claim(comm_text, cl_1_list)
 
 st.text_area(
     "Edited Claim 1 with Citations:",
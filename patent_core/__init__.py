@@ -0,0 +1,10 @@
+# patent_core/__init__.py
+#
+# Streamlit-free analysis core shared by the app pages and the command line:
+#   python -m patent_core {extract,graph,markers,cite,docx,run-all} <filename>
+#
+# Kept import-free apart from the stdlib-only paths module, so importing one
+# submodule (e.g. patent_core.paths from utils.py) does not load spaCy, pandas
+# or python-docx. Import the stages from patent_core.pipeline.
+
+from patent_core.paths import DATA_DIR, secure_filename, summary_json_path
@@ -0,0 +1,6 @@
+# patent_core/__main__.py
+
+import sys
+from patent_core.cli import main
+
+sys.exit(main())
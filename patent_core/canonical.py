@@ -0,0 +1,208 @@
+# patent_core/canonical.py
+
+import re
+import zlib
+from difflib import SequenceMatcher
+import numpy as np
+
+# Leading words that do not change which feature a mention refers to
+_DETERMINERS = re.compile(
+    r"^(?:(?:a|an|the|said|each|every|either|any|such|this|these|those|its|their|"
+    r"at least one|one or more|a plurality of|plurality of)\s+)+",
+    re.IGNORECASE
+)
+_ANAPHORIC = ("the ", "said ")
+_INDEFINITE = ("a ", "an ")
+
+# Mentions that differ in one of these words are never merged by similarity
+_DISTINGUISHING = {
+    "first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth", "tenth",
+    "upper", "lower", "inner", "outer", "left", "right", "front", "rear", "top", "bottom",
+    "primary", "secondary", "input", "output", "inlet", "outlet"
+}
+
+# A word that only adds one of these to another word names a different feature ("drive"/"driven")
+_INFLECTIONS = ("d", "n", "r", "ed", "en", "er", "ing", "ion", "al")
+
+# Irregular plurals the suffix rules below would get wrong
+_IRREGULAR = {
+    "axes": "axis", "analyses": "analysis", "hypotheses": "hypothesis",
+    "matrices": "matrix", "vertices": "vertex", "indices": "index", "apices": "apex"
+}
+_SIBILANT = ("s", "x", "z", "ch", "sh")
+
+NGRAM_SIZE = 3
+NGRAM_DIM = 1024
+SIMILARITY_BLOCK = 1024
+# n-gram cosine a pair needs before its spelling is compared at all
+CANDIDATE_SIMILARITY = 0.5
+
+
+# --- Keys ---
+def _singular(word):
+    # Same key for the singular and the plural, though not always a real word:
+    # "gas"/"gases" -> "ga", "lens"/"lenses" -> "len", "case"/"cases" -> "ca"
+    word = _IRREGULAR.get(word, word)
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("es") and word[:-2].endswith(_SIBILANT):
+        word = word[:-2]
+    elif word.endswith("e") and word[:-1].endswith(_SIBILANT):
+        word = word[:-1]
+    if len(word) > 2 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    return word
+
+
+def canonical_key(mention):
+    # "The sealing members" -> "sealing member"
+    words = _DETERMINERS.sub("", mention.strip().lower()).split()
+    if not words:
+        return mention.strip().lower()
+    words[-1] = _singular(words[-1])
+    return " ".join(words)
+
+
+def _lemma_key(stripped, doc):
+    # Only the head noun is lemmatised, like canonical_key: lemmatising the modifiers would
+    # merge "a heated element" with "a heating element" (see _INFLECTIONS)
+    words = stripped.split()
+    if not words or not len(doc):
+        return stripped
+    head = doc[-1]
+    if words[-1].endswith(head.text):
+        words[-1] = words[-1][:len(words[-1]) - len(head.text)] + head.lemma_.lower()
+    return " ".join(words)
+
+
+def _lemma_keys(mentions, nlp):
+    # spaCy lemma of the head noun instead of the suffix rules; determiners are still stripped first
+    stripped = [_DETERMINERS.sub("", m.strip().lower()) for m in mentions]
+    return [
+        _lemma_key(text, doc) or m.strip().lower()
+        for m, text, doc in zip(mentions, stripped, nlp.pipe(stripped))
+    ]
+
+
+# --- Similarity ---
+def _ngram_vectors(keys):
+    # Hashed character n-gram counts, one L2-normalised row per key
+    rows, cols = [], []
+    for row, key in enumerate(keys):
+        padded = f" {key} "
+        for i in range(len(padded) - NGRAM_SIZE + 1):
+            rows.append(row)
+            cols.append(zlib.crc32(padded[i:i + NGRAM_SIZE].encode("utf-8")) % NGRAM_DIM)
+    vectors = np.zeros((len(keys), NGRAM_DIM), dtype=np.float32)
+    np.add.at(vectors, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _inflected(a, b):
+    for x, y in zip(a.split(), b.split()):
+        short, long = sorted((x, y), key=len)
+        if x != y and long.startswith(short) and long[len(short):] in _INFLECTIONS:
+            return True
+    return False
+
+
+def is_spelling_variant(a, b, threshold):
+    # Typos and spelling variants of one feature, not related but different features
+    if set(a.split()) & _DISTINGUISHING != set(b.split()) & _DISTINGUISHING or _inflected(a, b):
+        return False
+    return SequenceMatcher(None, a, b).ratio() >= threshold
+
+
+def similar_pairs(keys, threshold):
+    # Cheap n-gram cosine (block-wise, so memory stays at SIMILARITY_BLOCK x len(keys)) picks
+    # the candidates; only those are compared character by character
+    vectors = _ngram_vectors(keys)
+    for start in range(0, len(keys), SIMILARITY_BLOCK):
+        sims = vectors[start:start + SIMILARITY_BLOCK] @ vectors.T
+        rows, cols = np.nonzero(sims >= min(threshold, CANDIDATE_SIMILARITY))
+        rows += start
+        for i, j in zip(rows[cols > rows].tolist(), cols[cols > rows].tolist()):
+            if is_spelling_variant(keys[i], keys[j], threshold):
+                yield i, j
+
+
+# --- Index ---
+class FeatureIndex:
+    """Maps every feature mention to one canonical feature ID.
+
+    Mentions are grouped by determiner-free keys with a singular head noun
+    (its spaCy lemma when ``nlp`` is given) and, if ``similarity`` is set,
+    keys that are spelling variants (difflib ratio at least that threshold)
+    are merged as well. The canonical name of a feature is its first indefinite ("a ...")
+    mention, or its first mention if it is never introduced.
+    """
+
+    def __init__(self, mentions, similarity=None, nlp=None):
+        mentions = list(dict.fromkeys(mentions))
+        mention_keys = _lemma_keys(mentions, nlp) if nlp is not None else [canonical_key(m) for m in mentions]
+        keys = list(dict.fromkeys(mention_keys))
+
+        parent = list(range(len(keys)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        if similarity is not None and len(keys) > 1:
+            for i, j in similar_pairs(keys, similarity):
+                a, b = find(i), find(j)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+        root_ids = {}
+        self.key_ids = {}
+        for i, key in enumerate(keys):
+            self.key_ids[key] = root_ids.setdefault(find(i), len(root_ids))
+
+        self.ids = {m: self.key_ids[k] for m, k in zip(mentions, mention_keys)}
+        self.names = [None] * len(root_ids)
+        for mention in mentions:
+            fid = self.ids[mention]
+            if self.names[fid] is None or (
+                mention.lower().startswith(_INDEFINITE) and not self.names[fid].lower().startswith(_INDEFINITE)
+            ):
+                self.names[fid] = mention
+        self._nlp = nlp
+
+    def __len__(self):
+        return len(self.names)
+
+    def feature_id(self, mention):
+        fid = self.ids.get(mention)
+        if fid is None:
+            key = _lemma_keys([mention], self._nlp)[0] if self._nlp is not None else canonical_key(mention)
+            fid = self.key_ids.get(key)
+        return fid
+
+    def canonical(self, mention):
+        fid = self.feature_id(mention)
+        return mention if fid is None else self.names[fid]
+
+
+def is_anaphoric(mention):
+    return mention.lower().startswith(_ANAPHORIC)
+
+
+def canonical_features(features, similarity=None, nlp=None):
+    # One entry per feature per claim; "the/said" mentions only survive if the feature is never introduced
+    index = FeatureIndex((term for terms in features.values() for term in terms), similarity=similarity, nlp=nlp)
+    introduced = {index.ids[term] for terms in features.values() for term in terms if not is_anaphoric(term)}
+    seen, canonical = set(), {}
+    for k, terms in features.items():
+        kept = []
+        for term in terms:
+            fid = index.ids[term]
+            if is_anaphoric(term) and (fid in introduced or fid in seen):
+                continue
+            seen.add(fid)
+            kept.append(index.names[fid])
+        canonical[k] = list(dict.fromkeys(kept))
+    return canonical
@@ -0,0 +1,248 @@
+# patent_core/catalog.py
+
+import argparse
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from patent_core.framelog import FrameLog
+from patent_core.storage import file_stamp, load_summary, summary_lock
+
+CATALOG_NAME = "catalog.manifest"
+
+# The only summary sections decoded for an entry (read lazily from the snapshot when it is fresh)
+CATALOG_SECTIONS = ["Date", "Nr. Claims", "User Entered Claims", "Edited Feature Table", "Network", "Revision"]
+
+# Running totals kept for the dashboard
+_COUNTED = ("claims", "features", "nodes", "edges")
+
+
+def catalog_path(data_dir):
+    return Path(data_dir) / CATALOG_NAME
+
+
+# --- Entries ---
+def _claim_count(data):
+    nr_claims = str(data.get("Nr. Claims", "")).strip()
+    if nr_claims.isdigit():
+        return int(nr_claims)
+    return len(data.get("User Entered Claims", {}))
+
+
+def summary_entry(json_path, data):
+    # Metadata of one application; everything the picker and dashboard need without opening the summary
+    json_path = Path(json_path)
+    filename = json_path.parent.name
+    network = data.get("Network", {})
+    stamp = file_stamp(json_path)
+    return {
+        "date": data.get("Date", ""),
+        "claims": _claim_count(data),
+        "features": sum(len(values) for values in data.get("Edited Feature Table", {}).values()),
+        "nodes": len(network.get("nodes", [])),
+        "edges": len(network.get("edges", [])),
+        "docx": (json_path.parent / f"Summary_{filename}.docx").exists(),
+        "revision": data.get("Revision", 0),
+        "stamp": list(stamp or ()),
+        "saved": stamp[0] / 1e9 if stamp else time.time(),
+    }
+
+
+def _year(entry):
+    # Dates are entered as dd-mm-yyyy on the General page
+    date = entry.get("date") or ""
+    return date[-4:] if date[-4:].isdigit() else None
+
+
+class Catalog:
+    """Manifest of every application under the data directory.
+
+    Like the undo history it is a ``FrameLog``: a save appends the new entry
+    of one application, and readers only parse the frames appended since
+    their last refresh. The dashboard totals are
+    updated entry by entry as frames are applied, so neither the picker nor
+    the statistics ever have to scan ``data/``.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self.path = catalog_path(data_dir)
+        self.entries = {}
+        self.totals = Counter()
+        self.years = Counter()
+        self._log = FrameLog(self.path)
+        self._frames = 0
+        self._mutex = threading.Lock()
+
+    # --- Totals ---
+    def _count(self, entry, sign):
+        self.totals["applications"] += sign
+        for key in _COUNTED:
+            self.totals[key] += sign * entry.get(key, 0)
+        self.totals["docx"] += sign * bool(entry.get("docx"))
+        self.totals["synced"] += sign * bool(entry.get("drive_sync"))
+        year = _year(entry)
+        if year is not None:
+            self.years[year] += sign
+            if not self.years[year]:
+                del self.years[year]
+
+    def _put(self, name, entry):
+        if name in self.entries:
+            self._count(self.entries[name], -1)
+        if entry is None:
+            self.entries.pop(name, None)
+        else:
+            self.entries[name] = entry
+            self._count(entry, 1)
+
+    # --- Log file ---
+    def _apply_frame(self, frame):
+        if frame["op"] == "set":
+            self._put(frame["name"], frame["entry"])
+        elif frame["op"] == "update":
+            if frame["name"] in self.entries:
+                self._put(frame["name"], {**self.entries[frame["name"]], **frame["fields"]})
+        elif frame["op"] == "drop":
+            self._put(frame["name"], None)
+        elif frame["op"] == "bulk":
+            for name, entry in frame["entries"].items():
+                self._put(name, entry)
+        self._frames += 1
+
+    def refresh(self):
+        with self._mutex:
+            replaced, frames = self._log.read()
+            if replaced:
+                self.entries, self.totals, self.years, self._frames = {}, Counter(), Counter(), 0
+            for frame in frames:
+                self._apply_frame(frame)
+
+    def _append(self, frames):
+        # Caller holds the catalog lock, so frames from different processes never interleave
+        self.refresh()
+        with self._mutex:
+            self._log.append(frames)
+            for frame in frames:
+                self._apply_frame(frame)
+            if self._frames > 2 * len(self.entries) + 50:
+                self._log.rewrite([{"op": "bulk", "entries": self.entries}])
+                self._frames = 1
+
+    # --- Updates ---
+    def _keep_sync(self, name, entry):
+        # A saved summary replaces the entry but not its last Drive sync (one dict lookup, no lock needed)
+        previous = self.entries.get(name)
+        if previous is not None and previous.get("drive_sync"):
+            entry["drive_sync"] = previous["drive_sync"]
+        return entry
+
+    def record(self, json_path, data):
+        name = Path(json_path).parent.name
+        with summary_lock(self.path):
+            self.refresh()
+            self._append([{"op": "set", "name": name, "entry": self._keep_sync(name, summary_entry(json_path, data))}])
+
+    def record_entries(self, entries):
+        # Many new entries ({name: summary_entry(...)}, e.g. from a bulk ingest) in one frame
+        with summary_lock(self.path):
+            self.refresh()
+            entries = {name: self._keep_sync(name, entry) for name, entry in entries.items()}
+            self._append([{"op": "bulk", "entries": entries}])
+
+    def update(self, name, **fields):
+        # Metadata that changes without a summary save (Word export, Drive sync)
+        with summary_lock(self.path):
+            self._append([{"op": "update", "name": name, "fields": fields}])
+
+    def mark_drive_sync(self, name):
+        self.update(name, drive_sync=time.time())
+
+    def mark_docx(self, name):
+        self.update(name, docx=True)
+
+    def rescan(self):
+        """Bring the catalog in line with the folders under the data directory.
+
+        Only summaries whose file changed since their entry was written are
+        opened; entries of deleted folders are dropped. Needed once for data
+        that predates the catalog or was copied in by hand.
+        """
+        self.refresh()
+        with self._mutex:
+            # A copy, so other sessions are not blocked while the folders are read
+            entries = dict(self.entries)
+        frames, seen = [], set()
+        with os.scandir(self.data_dir) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                json_path = Path(folder.path) / f"Summary_{folder.name}.json"
+                stamp = file_stamp(json_path)
+                if stamp is None:
+                    continue
+                seen.add(folder.name)
+                entry = entries.get(folder.name)
+                if entry is not None and entry.get("stamp") == list(stamp):
+                    continue
+                entry = self._keep_sync(folder.name, summary_entry(json_path, load_summary(json_path, CATALOG_SECTIONS)))
+                frames.append({"op": "set", "name": folder.name, "entry": entry})
+        frames += [{"op": "drop", "name": name} for name in entries if name not in seen]
+        with summary_lock(self.path):
+            # Also creates an empty catalog, so an empty data folder is not rescanned on every run
+            self._append(frames)
+        return len(frames)
+
+    # --- Queries ---
+    # Sessions share one catalog per process, so readers take the mutex while another session's
+    # save applies its frames; entries are replaced, never changed in place, so they can be returned
+    def search(self, query="", docx=None, synced=None):
+        # Returns [(name, entry), ...] sorted by name
+        query = query.strip().lower()
+        matches = []
+        with self._mutex:
+            for name, entry in self.entries.items():
+                if query and query not in name.lower():
+                    continue
+                if docx is not None and bool(entry.get("docx")) != docx:
+                    continue
+                if synced is not None and bool(entry.get("drive_sync")) != synced:
+                    continue
+                matches.append((name, entry))
+        return sorted(matches, key=lambda match: match[0])
+
+    def stats(self):
+        with self._mutex:
+            totals, years = Counter(self.totals), dict(sorted(self.years.items()))
+        applications = totals["applications"]
+        stats = {key: totals[key] for key in ("applications", *_COUNTED, "docx", "synced")}
+        for key in _COUNTED:
+            stats[f"avg_{key}"] = totals[key] / applications if applications else 0
+        stats["years"] = years
+        return stats
+
+
+# One catalog per data directory and process, so a save only reads the frames it has not seen yet
+_catalogs = {}
+_catalogs_mutex = threading.Lock()
+
+
+def open_catalog(data_dir):
+    key = str(Path(data_dir).resolve())
+    with _catalogs_mutex:
+        if key not in _catalogs:
+            _catalogs[key] = Catalog(data_dir)
+    catalog = _catalogs[key]
+    catalog.refresh()
+    return catalog
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or inspect the application catalog.")
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args()
+
+    catalog = open_catalog(args.data_dir)
+    print(f"✅ {catalog.rescan()} entries updated.")
+    print(catalog.stats())
@@ -0,0 +1,27 @@
+# patent_core/cite.py
+
+import re
+
+CITATION = " (D1: abstr., fig., page )"
+
+
+def cit_claim(comm_text, cl_1_list, citation=CITATION):
+    # Adds a citation placeholder after every claim 1 feature and breaks lines per feature
+    pattern = r'\b(' + '|'.join(map(re.escape, cl_1_list)) + r')\b'
+
+    def replacement(match):
+        return f"{match.group(0)}{citation}"
+
+    updated_text = re.sub(pattern, replacement, comm_text, count=0)
+    updated_text = re.sub(r"^[^a-zA-Z]+", "", updated_text)
+    updated_text = re.sub(r"\)([.,;:]?)", r")\1\n", updated_text)
+    updated_text = re.sub(r"([.,;:]) (\b(?:a|an)\b )", r"\1\n\2", updated_text)
+    return updated_text
+
+
+def claim_citations(data):
+    comm_text = data.get("User Entered Claims", {}).get("Cl_1", "")
+    cl_1_list = data.get("Edited Feature Table", {}).get("Cl_1", [])
+    if not comm_text or not cl_1_list:
+        return ""
+    return cit_claim(comm_text, cl_1_list)
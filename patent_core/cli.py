@@ -0,0 +1,73 @@
+# patent_core/cli.py
+
+import argparse
+import sys
+from patent_core.storage import SaveConflict
+from patent_core import pipeline
+from patent_core.extract import SIMILARITY_THRESHOLD
+from patent_core.markers import MAX_BRANCHES
+from patent_core.paths import DATA_DIR, secure_filename, summary_json_path
+
+# Stages whose result is written back to the summary
+SAVED_STAGES = {"extract", "graph", "markers"}
+
+
+def run_stages(filename, stages, data_dir=DATA_DIR, similarity=None, claims_file=None, out=sys.stdout):
+    # All stages share one in-memory summary; it is loaded once and saved once at the end
+    if claims_file is not None and not summary_json_path(filename, data_dir).exists():
+        # New application: the claims file is its first content
+        summary_json_path(filename, data_dir).parent.mkdir(parents=True, exist_ok=True)
+        data, base = {}, None
+    else:
+        data, base = pipeline.load(filename, data_dir)
+    changed = []
+    for stage in stages:
+        if stage == "extract":
+            claims_text = None
+            if claims_file is not None:
+                with open(claims_file, "r", encoding="utf-8") as f:
+                    claims_text = f.read()
+            pipeline.run_extract(data, claims_text=claims_text, similarity=similarity)
+            print(f"✅ Features extracted for {len(data['User Entered Claims'])} claims", file=out)
+        elif stage == "graph":
+            pipeline.run_graph(data)
+            network = data["Network"]
+            print(f"✅ Graph built: {len(network['nodes'])} nodes, {len(network['edges'])} edges", file=out)
+        elif stage == "markers":
+            _, truncated = pipeline.run_markers(data)
+            for head, count in truncated.items():
+                print(f"⚠️ '{head}' has {count or 'too many'} branches; only the first {MAX_BRANCHES} are listed.",
+                      file=out)
+            print(f"✅ Markers generated for {len(data['Markers']['Heads'])} heads", file=out)
+        elif stage == "cite":
+            print(pipeline.run_cite(data), file=out)
+        elif stage == "docx":
+            print(f"✅ Word document written to {pipeline.run_docx(data, filename, data_dir)}", file=out)
+        if stage in SAVED_STAGES:
+            changed.append(stage)
+
+    if changed:
+        pipeline.save(filename, data, base, f"CLI {', '.join(changed)}", data_dir)
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m patent_core",
+        description="Run the patent analysis stages on a saved summary without the web app."
+    )
+    parser.add_argument("command", choices=[*pipeline.STAGES, "run-all"])
+    parser.add_argument("filename", help="Application name, i.e. the folder under the data directory")
+    parser.add_argument("--data-dir", default=str(DATA_DIR))
+    parser.add_argument("--similarity", type=float, nargs="?", const=SIMILARITY_THRESHOLD, default=None,
+                        help=f"Merge near-duplicate feature spellings (edit similarity, default {SIMILARITY_THRESHOLD})")
+    parser.add_argument("--claims", default=None, help="Text file with one claim per line (extract only)")
+    args = parser.parse_args(argv)
+
+    stages = pipeline.STAGES if args.command == "run-all" else [args.command]
+    try:
+        run_stages(secure_filename(args.filename), stages, args.data_dir, args.similarity, args.claims)
+    except (pipeline.StageError, SaveConflict, FileNotFoundError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
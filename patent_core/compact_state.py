@@ -0,0 +1,365 @@
+# patent_core/compact_state.py
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+from patent_core.canonical import canonical_features
+
+FEATURE_SECTIONS = ("Feature Table", "Edited Feature Table", "Concatenated DataFrame")
+NETWORK_SECTION = "Network"
+CONCAT_COLUMNS = ("a_list", "prep_list", "the_list", "Cl_nr")
+
+
+# --- String interning ---
+class StringPool:
+    # Every feature/node/label string is stored once and referred to by index
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def intern(self, value):
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            value = sys.intern(value)
+            self.strings.append(value)
+            self.ids[value] = idx
+        return idx
+
+    def __getitem__(self, idx):
+        return self.strings[idx]
+
+
+def _all_str(values):
+    return all(isinstance(v, str) for v in values)
+
+
+# --- Feature table ---
+class FeatureTable:
+    """Canonical feature table from which the three JSON feature views are derived.
+
+    Rows are stored as parallel integer arrays (claim index, feature id). The
+    edited view defaults to what the extractor makes of the raw table
+    (``canonical_features``); only the claims the user changed are stored, and
+    the concatenated view only keeps the prep/the cells that are not empty.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.claims = []
+        self.loaded = set()
+        self.raw_labels, self.raw = [], (array("i"), array("i"))
+        self.edited_labels, self.edited = [], None
+        self._default = None
+        self.prep, self.the, self.concat = {}, {}, None
+
+    def _rows(self, table):
+        claim_idx, feature_idx = array("i"), array("i")
+        for label, terms in table.items():
+            if label not in self.claims:
+                self.claims.append(sys.intern(label))
+            c = self.claims.index(label)
+            for term in terms:
+                claim_idx.append(c)
+                feature_idx.append(self.pool.intern(term))
+        return claim_idx, feature_idx
+
+    def _table(self, rows, labels):
+        table = {label: [] for label in labels}
+        for c, f in zip(*rows):
+            table[self.claims[c]].append(self.pool[f])
+        return table
+
+    # Sections as they appear in Summary_<filename>.json
+    def feature_table(self):
+        return self._table(self.raw, self.raw_labels)
+
+    def _default_edited(self):
+        if self._default is None:
+            self._default = canonical_features(self.feature_table())
+        return self._default
+
+    def edited_feature_table(self):
+        default = self._default_edited()
+        if self.edited is None:
+            return {label: list(terms) for label, terms in default.items()}
+        return {
+            label: [self.pool[f] for f in self.edited[label]] if label in self.edited else list(default[label])
+            for label in self.edited_labels
+        }
+
+    def concatenated_dataframe(self):
+        if self.concat is not None:
+            return {col: [self.pool[i] for i in ids] for col, ids in self.concat.items()}
+        flat = {col: [] for col in CONCAT_COLUMNS}
+        for label, terms in self.edited_feature_table().items():
+            for term in terms:
+                row = len(flat["a_list"])
+                flat["a_list"].append(term)
+                flat["prep_list"].append(self.pool[self.prep[row]] if row in self.prep else "")
+                flat["the_list"].append(self.pool[self.the[row]] if row in self.the else "")
+                flat["Cl_nr"].append(label)
+        return flat
+
+    def view(self, key):
+        return {
+            "Feature Table": self.feature_table,
+            "Edited Feature Table": self.edited_feature_table,
+            "Concatenated DataFrame": self.concatenated_dataframe,
+        }[key]()
+
+    def load(self, key, value):
+        # Sections must be loaded in FEATURE_SECTIONS order; each one builds on the previous
+        if key == "Feature Table" and _is_str_table(value):
+            self.raw_labels, self.raw = list(value), self._rows(value)
+            self._default = None
+        elif key == "Edited Feature Table" and "Feature Table" in self.loaded and _is_str_table(value):
+            self.edited_labels = [sys.intern(label) for label in value]
+            default = self._default_edited()
+            overrides = {
+                label: array("i", map(self.pool.intern, terms))
+                for label, terms in value.items() if default.get(label) != terms
+            }
+            # Reordered or removed claims must survive the round trip as well
+            if overrides or list(value) != list(default):
+                self.edited = overrides
+        elif key == "Concatenated DataFrame" and "Edited Feature Table" in self.loaded and _is_concat(value):
+            derived = self.concatenated_dataframe()
+            if value["a_list"] == derived["a_list"] and value["Cl_nr"] == derived["Cl_nr"]:
+                self.prep = {i: self.pool.intern(v) for i, v in enumerate(value["prep_list"]) if v}
+                self.the = {i: self.pool.intern(v) for i, v in enumerate(value["the_list"]) if v}
+            else:
+                self.concat = {col: array("i", map(self.pool.intern, value[col])) for col in CONCAT_COLUMNS}
+        else:
+            return False
+        self.loaded.add(key)
+        return True
+
+
+def _is_str_table(table):
+    return isinstance(table, dict) and all(isinstance(v, list) and _all_str(v) for v in table.values())
+
+
+def _is_concat(flat):
+    if not isinstance(flat, dict) or list(flat) != list(CONCAT_COLUMNS):
+        return False
+    if not all(isinstance(v, list) and _all_str(v) for v in flat.values()):
+        return False
+    return len({len(v) for v in flat.values()}) == 1
+
+
+# --- Graph ---
+class CompactGraph:
+    """Directed feature graph with interned node names and integer edge arrays.
+
+    Mirrors the small part of the networkx API used by the pages and converts
+    to and from both ``nx.DiGraph`` and the JSON ``Network`` section.
+    """
+
+    def __init__(self, pool=None):
+        self.pool = pool or StringPool()
+        self.node_ids, self.node_colors = array("i"), array("i")
+        self.src, self.dst, self.labels = array("i"), array("i"), array("i")
+        # Positions in the arrays above, so lookups do not scan them
+        self._node_pos, self._edge_pos = {}, {}
+
+    def _reindex(self):
+        # Deletions shift array positions; the arrays keep their order for the JSON output
+        self._node_pos = {n: i for i, n in enumerate(self.node_ids)}
+        self._edge_pos = {(u, v): i for i, (u, v) in enumerate(zip(self.src, self.dst))}
+
+    def __contains__(self, node):
+        idx = self.pool.ids.get(node)
+        return idx is not None and idx in self._node_pos
+
+    @property
+    def nodes(self):
+        return [self.pool[i] for i in self.node_ids]
+
+    @property
+    def edges(self):
+        return [(self.pool[u], self.pool[v]) for u, v in zip(self.src, self.dst)]
+
+    def add_node(self, node, color="lightblue"):
+        idx = self.pool.intern(node)
+        pos = self._node_pos.get(idx)
+        if pos is not None:
+            self.node_colors[pos] = self.pool.intern(color)
+            return
+        self._node_pos[idx] = len(self.node_ids)
+        self.node_ids.append(idx)
+        self.node_colors.append(self.pool.intern(color))
+
+    def remove_node(self, node):
+        idx = self.pool.ids[node]
+        pos = self._node_pos[idx]
+        del self.node_ids[pos]
+        del self.node_colors[pos]
+        keep = [i for i, (u, v) in enumerate(zip(self.src, self.dst)) if u != idx and v != idx]
+        self.src = array("i", (self.src[i] for i in keep))
+        self.dst = array("i", (self.dst[i] for i in keep))
+        self.labels = array("i", (self.labels[i] for i in keep))
+        self._reindex()
+
+    def add_edge(self, source, target, label=""):
+        for node in (source, target):
+            if node not in self:
+                self.add_node(node)
+        u, v = self.pool.ids[source], self.pool.ids[target]
+        pos = self._edge_pos.get((u, v))
+        if pos is None:
+            self._edge_pos[u, v] = len(self.src)
+            self.src.append(u)
+            self.dst.append(v)
+            self.labels.append(self.pool.intern(label))
+        else:
+            self.labels[pos] = self.pool.intern(label)
+
+    def remove_edge(self, source, target):
+        pos = self._edge_pos[self.pool.ids[source], self.pool.ids[target]]
+        del self.src[pos]
+        del self.dst[pos]
+        del self.labels[pos]
+        self._reindex()
+
+    def node_color(self, node):
+        return self.pool[self.node_colors[self._node_pos[self.pool.ids[node]]]]
+
+    # --- Converters ---
+    def to_network_data(self):
+        return {
+            "nodes": [{"id": self.pool[n], "color": self.pool[c]} for n, c in zip(self.node_ids, self.node_colors)],
+            "edges": [
+                {"source": self.pool[u], "target": self.pool[v], "label": self.pool[l]}
+                for u, v, l in zip(self.src, self.dst, self.labels)
+            ]
+        }
+
+    @classmethod
+    def from_network_data(cls, network_data, pool=None):
+        graph = cls(pool)
+        for node in network_data.get("nodes", []):
+            graph.add_node(node["id"], node["color"])
+        for edge in network_data.get("edges", []):
+            graph.add_edge(edge["source"], edge["target"], edge.get("label", ""))
+        return graph
+
+    def to_networkx(self):
+        import networkx as nx
+        G = nx.DiGraph()
+        for n, c in zip(self.node_ids, self.node_colors):
+            G.add_node(self.pool[n], color=self.pool[c])
+        for u, v, l in zip(self.src, self.dst, self.labels):
+            G.add_edge(self.pool[u], self.pool[v], label=self.pool[l])
+        return G
+
+    @classmethod
+    def from_networkx(cls, G, pool=None):
+        graph = cls(pool)
+        for node, attrs in G.nodes(data=True):
+            graph.add_node(str(node), attrs.get("color", "lightblue"))
+        for u, v, attrs in G.edges(data=True):
+            graph.add_edge(str(u), str(v), attrs.get("label", ""))
+        return graph
+
+
+def _is_plain_network(network_data):
+    if not isinstance(network_data, dict) or list(network_data) != ["nodes", "edges"]:
+        return False
+    nodes_ok = all(
+        isinstance(n, dict) and list(n) == ["id", "color"] and _all_str(n.values())
+        for n in network_data["nodes"]
+    )
+    edges_ok = all(
+        isinstance(e, dict) and list(e) == ["source", "target", "label"] and _all_str(e.values())
+        for e in network_data["edges"]
+    )
+    if not (nodes_ok and edges_ok):
+        return False
+    # Duplicate nodes/edges would be merged by the graph, so keep those sections as they are
+    ids = [n["id"] for n in network_data["nodes"]]
+    pairs = [(e["source"], e["target"]) for e in network_data["edges"]]
+    return len(set(ids)) == len(ids) and len(set(pairs)) == len(pairs) and {x for p in pairs for x in p} <= set(ids)
+
+
+# --- Summary ---
+class CompactSummary(MutableMapping):
+    """Drop-in replacement for the ``summary_data`` dict kept in session state.
+
+    Feature sections share one ``FeatureTable`` and the ``Network`` section is
+    held as a ``CompactGraph``; both are expanded to plain JSON values only
+    when a page reads them. Any section that does not match the expected
+    schema is kept as-is, so ``summary_to_dict`` is always lossless.
+    """
+
+    def __init__(self, data=None):
+        self.pool = StringPool()
+        self.features = FeatureTable(self.pool)
+        self.network = None
+        self._keys = {}
+        self._plain = {}
+        for key, value in (data or {}).items():
+            self[key] = value
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in self._plain:
+            return self._plain[key]
+        if key == NETWORK_SECTION:
+            return self.network.to_network_data()
+        return self.features.view(key)
+
+    def __setitem__(self, key, value):
+        if key in FEATURE_SECTIONS:
+            self._set_features(key, value)
+            return
+        self._keys[key] = None
+        self._plain.pop(key, None)
+        if key == NETWORK_SECTION and _is_plain_network(value):
+            self.network = CompactGraph.from_network_data(value, self.pool)
+        else:
+            self._plain[key] = value
+
+    def _set_features(self, key, value):
+        # The views depend on each other, so the canonical table is rebuilt from all three
+        views = {k: self[k] for k in FEATURE_SECTIONS if k in self._keys and k != key}
+        views[key] = value
+        self._keys[key] = None
+        self.features = FeatureTable(self.pool)
+        for k in FEATURE_SECTIONS:
+            self._plain.pop(k, None)
+            if k in views and not self.features.load(k, views[k]):
+                self._plain[k] = views[k]
+
+    def __delitem__(self, key):
+        if key in FEATURE_SECTIONS:
+            views = {k: self[k] for k in FEATURE_SECTIONS if k in self._keys and k != key}
+            del self._keys[key]
+            self.features = FeatureTable(self.pool)
+            for k in FEATURE_SECTIONS:
+                self._plain.pop(k, None)
+                if k in views and not self.features.load(k, views[k]):
+                    self._plain[k] = views[k]
+            return
+        del self._keys[key]
+        self._plain.pop(key, None)
+        if key == NETWORK_SECTION:
+            self.network = None
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def compact_summary(data):
+    if isinstance(data, CompactSummary):
+        return data
+    return CompactSummary(data)
+
+
+def summary_to_dict(data):
+    # Plain dict in the Summary_<filename>.json schema (json.dump needs a real dict)
+    return {key: data[key] for key in data}
@@ -0,0 +1,107 @@
+# patent_core/extract.py
+
+import re
+import pandas as pd
+from patent_core.canonical import canonical_features
+from patent_core.segmenter import iter_segments, iter_article_pairs, remove_parenthesized_text
+
+SPACY_MODEL = "en_core_web_sm"
+# Default for "merge near-duplicate spellings" (see canonical.is_spelling_variant)
+SIMILARITY_THRESHOLD = 0.9
+
+
+def load_nlp():
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+
+# --- Claims ---
+def split_claims(claims_text):
+    # One claim per non-empty line, as entered in the Extract page text area
+    claims_list = [claim.strip() for claim in claims_text.split("\n") if claim.strip()]
+    return [remove_parenthesized_text(claim) for claim in claims_list]
+
+
+def extract_noun_chunks(claim, nlp):
+    # Oversized claims are parsed segment by segment; only one Doc is alive at a time
+    chunks = []
+    for doc, offset in nlp.pipe(iter_segments(claim), as_tuples=True, batch_size=1):
+        for chunk in doc.noun_chunks:
+            words = chunk.text.split()
+            if doc[chunk.start].pos_ == "DET" and doc[chunk.start].text.lower() not in {"a", "an", "the"}:
+                words = words[1:]
+            for i, word in enumerate(words):
+                if word.lower() in {"for", "with", "by", "of", "on", "at"}:
+                    words = words[:i]
+                    break
+            noun_phrase = " ".join(words).strip()
+            if noun_phrase and len(noun_phrase.split()) > 1:
+                chunks.append((offset + chunk.start_char, noun_phrase))
+
+    # Merge segment results back into claim order
+    chunks = [phrase for _, phrase in sorted(chunks, key=lambda item: item[0])]
+
+    first_pair = next(iter_article_pairs(claim), None)
+    if first_pair:
+        chunks.insert(0, first_pair)
+    return chunks
+
+
+def extract_features(cleaned_claims, nlp):
+    return {i: extract_noun_chunks(claim, nlp) for i, claim in enumerate(cleaned_claims)}
+
+
+def apply_highlighting(claim, chunks):
+    highlighted = claim
+    for chunk in chunks:
+        highlighted = re.sub(rf'\b{re.escape(chunk)}\b', f'<b style="color:red;">{chunk}</b>', highlighted)
+    return highlighted
+
+
+# --- Feature table ---
+def create_feature_table(features, num_claims, similarity=None, nlp=None):
+    filtered = canonical_features(features, similarity, nlp)
+    df = pd.DataFrame.from_dict(filtered, orient="index").T
+    df.columns = [f"Cl_{i+1}" for i in range(num_claims)]
+    df.index = [f"Feature {i+1}" for i in range(df.shape[0])]
+    return df
+
+
+def table_from_frame(df):
+    return {col: df[col].dropna().tolist() for col in df.columns}
+
+
+def clean_table(table):
+    # Drops the empty cells left by the data editor
+    return {
+        col: [val for val in values if val is not None and pd.notna(val)]
+        for col, values in table.items()
+    }
+
+
+def concatenated_data(edited_table):
+    # Build data for network graph
+    flat_data = {
+        "a_list": [],
+        "prep_list": [],
+        "the_list": [],
+        "Cl_nr": []
+    }
+    for col, values in edited_table.items():
+        for val in values:
+            flat_data["a_list"].append(val)
+            flat_data["prep_list"].append("")   # editable later
+            flat_data["the_list"].append("")    # optional
+            flat_data["Cl_nr"].append(col)
+    return flat_data
+
+
+def extraction_sections(cleaned_claims, features, edited_table):
+    # The summary sections written by a feature extraction
+    edited_table = clean_table(edited_table)
+    return {
+        "User Entered Claims": {f"Cl_{i+1}": claim for i, claim in enumerate(cleaned_claims)},
+        "Feature Table": {f"Cl_{i+1}": features.get(i, []) for i in range(len(cleaned_claims))},
+        "Edited Feature Table": edited_table,
+        "Concatenated DataFrame": concatenated_data(edited_table),
+    }
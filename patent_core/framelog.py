@@ -0,0 +1,71 @@
+# patent_core/framelog.py
+
+import struct
+from pathlib import Path
+import srsly
+
+_FRAME = struct.Struct("<I")
+
+
+class FrameLog:
+    """Append-only file of msgpack frames, each prefixed with its length.
+
+    Shared by the undo history and the catalog. ``read`` only parses the
+    frames appended since the previous read, and reports when the file was
+    replaced by a compaction in another process so the owner can start over.
+    Callers serialise writers with ``summary_lock``.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.offset = 0
+        self.inode = None
+
+    def _mark(self):
+        stat = self.path.stat()
+        self.offset, self.inode = stat.st_size, stat.st_ino
+
+    def read(self):
+        # Returns (replaced, frames); when replaced the frames start from the beginning of the log
+        if not self.path.exists():
+            return False, []
+        stat = self.path.stat()
+        replaced = stat.st_ino != self.inode or stat.st_size < self.offset
+        if replaced:
+            self.offset, self.inode = 0, stat.st_ino
+        if stat.st_size == self.offset:
+            return replaced, []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            raw = f.read()
+        # One unpacker for all frames: srsly.msgpack_loads looks up its extensions on every call
+        unpacker = srsly.msgpack.Unpacker(raw=False, use_list=True)
+        frames, pos = [], 0
+        while pos + _FRAME.size <= len(raw):
+            (length,) = _FRAME.unpack_from(raw, pos)
+            if pos + _FRAME.size + length > len(raw):
+                break  # partially written frame; picked up on the next read
+            unpacker.feed(raw[pos + _FRAME.size:pos + _FRAME.size + length])
+            frames.append(next(unpacker))
+            pos += _FRAME.size + length
+        self.offset += pos
+        return replaced, frames
+
+    def _pack(self, frames):
+        pack = srsly.msgpack.Packer(use_bin_type=True).pack
+        return b"".join(_FRAME.pack(len(raw)) + raw for raw in map(pack, frames))
+
+    def append(self, frames):
+        raw = self._pack(frames)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(raw)
+        self._mark()
+
+    def rewrite(self, frames):
+        # Compaction: readers in other processes see the new inode and replay the log
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self._pack(frames))
+        tmp_path.replace(self.path)
+        self._mark()
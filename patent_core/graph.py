@@ -0,0 +1,91 @@
+# patent_core/graph.py
+
+from itertools import cycle
+import networkx as nx
+import pandas as pd
+from patent_core.canonical import canonical_key
+
+# Color cycle for claims
+COLORS = ["red", "orange", "lime", "turquoise", "hotpink", "khaki", "blue",
+          "green", "yellow", "violet", "coral", "pink", "steelblue",
+          "salmon", "tomato", "springgreen"] * 10
+
+
+def concatenated_dataframe(df_data):
+    # Pads the saved lists to equal length without touching the summary itself
+    columns = ['a_list', 'prep_list', 'the_list', 'Cl_nr']
+    lists = [list(df_data.get(col, [])) for col in columns]
+    max_len = max(len(values) for values in lists)
+    for values in lists:
+        values += [''] * (max_len - len(values))
+
+    rows = [[i, *(values[i] for values in lists)] for i in range(max_len)]
+    return pd.DataFrame(rows, columns=['index', *columns])
+
+
+def create_graph(df):
+    G = nx.DiGraph()
+    color_cycle = cycle(COLORS)
+    node_colors = {}
+    claim_colors = {}
+
+    # The a_list already holds the canonical names chosen by the extractor (FeatureIndex) and the
+    # user's edits, so they are the nodes as they are; merging them again here with other keys
+    # could join features the feature table keeps apart. Only "the/said" references are resolved.
+    introduced = {}
+    for node in df['a_list']:
+        if pd.notna(node) and node.strip():
+            introduced.setdefault(canonical_key(node), node)
+
+    for _, row in df.iterrows():
+        node = row['a_list']
+        claim = row['Cl_nr']
+        if pd.notna(node) and node.strip():
+            if node not in node_colors:
+                if claim not in claim_colors:
+                    claim_colors[claim] = next(color_cycle)
+                node_colors[node] = claim_colors[claim]
+
+    for node, color in node_colors.items():
+        G.add_node(node, color=color)
+
+    for i in range(len(df) - 2):
+        node_a, node_b = None, None
+        edge_label = df.at[i + 1, 'prep_list'] if pd.notna(df.at[i + 1, 'prep_list']) else ""
+
+        if pd.notna(df.at[i, 'a_list']) and df.at[i, 'a_list'].strip():
+            if pd.isna(df.at[i + 2, 'the_list']) or not df.at[i + 2, 'the_list'].strip():
+                if pd.notna(df.at[i + 2, 'a_list']) and df.at[i + 2, 'a_list'].strip():
+                    node_a = df.at[i, 'a_list']
+                    node_b = df.at[i + 2, 'a_list']
+        elif pd.notna(df.at[i, 'the_list']) and df.at[i, 'the_list'].strip():
+            if pd.notna(df.at[i + 2, 'a_list']) and df.at[i + 2, 'a_list'].strip():
+                node_a = introduced.get(canonical_key(df.at[i, 'the_list']))
+                node_b = df.at[i + 2, 'a_list']
+
+        if node_a and node_b and node_a != node_b:
+            G.add_edge(node_a, node_b, label=edge_label)
+
+    nx.set_node_attributes(G, {node: 0 for node in G.nodes}, "subset")
+    return G
+
+
+def graph_from_features(network_features):
+    return create_graph(concatenated_dataframe(network_features))
+
+
+# --- Saved "Network" section ---
+def graph_to_network_data(G):
+    return {
+        "nodes": [{"id": node, "color": G.nodes[node].get("color", "lightblue")} for node in G.nodes],
+        "edges": [{"source": u, "target": v, "label": G.edges[u, v].get("label", "")} for u, v in G.edges]
+    }
+
+
+def graph_from_network_data(network_data):
+    G = nx.DiGraph()
+    for node in network_data.get('nodes', []):
+        G.add_node(node['id'], color=node['color'])
+    for edge in network_data.get('edges', []):
+        G.add_edge(edge['source'], edge['target'], label=edge.get('label', ''))
+    return G
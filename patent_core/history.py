@@ -0,0 +1,199 @@
+# patent_core/history.py
+
+import hashlib
+import time
+import zlib
+from pathlib import Path
+import srsly
+from patent_core.framelog import FrameLog
+from patent_core.storage import SaveConflict, load_summary, save_summary, summary_lock
+
+MAX_HISTORY = 500
+CHUNK_BOUNDARY = 32
+
+# Sections that are bookkeeping rather than content (see storage.REVISION_KEY)
+IGNORED_SECTIONS = {"Revision"}
+
+
+def history_path(json_path):
+    return Path(json_path).with_suffix(".history")
+
+
+class SummaryHistory:
+    """Undo/redo history of a summary (or any dict of sections).
+
+    Every step maps section names to content digests; section values are
+    stored once per distinct content as compressed msgpack blobs, so a step
+    only costs the sections that actually changed. When ``path`` is given the
+    history is an append-only log of frames that survives restarts and is
+    shared by every session working on the same summary.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self.blobs = {}
+        self.steps = []
+        self.position = 0
+        self._log = FrameLog(path) if path is not None else None
+        self._frames = 0
+
+    @classmethod
+    def load(cls, path):
+        history = cls(path)
+        history.refresh()
+        return history
+
+    # --- Log file ---
+    def _step_frame(self, at, step, blobs):
+        # On disk a step only lists the sections that differ from the step before it
+        prev = self.steps[at - 1]["sections"] if at else {}
+        return {
+            "op": "step", "at": at, "label": step["label"], "time": step["time"],
+            "changed": {name: d for name, d in step["sections"].items() if prev.get(name) != d},
+            "removed": [name for name in prev if name not in step["sections"]],
+            "blobs": blobs
+        }
+
+    def _apply_frame(self, frame):
+        self.blobs.update(frame.get("blobs", {}))
+        if frame["op"] == "step":
+            at = frame["at"]
+            prev = self.steps[at - 1]["sections"] if at else {}
+            sections = {**prev, **frame["changed"]}
+            for name in frame["removed"]:
+                sections.pop(name, None)
+            step = {"label": frame["label"], "time": frame["time"], "sections": sections}
+            self.steps = self.steps[:at] + [step]
+            if len(self.steps) > MAX_HISTORY:
+                self.steps = self.steps[-MAX_HISTORY:]
+            self.position = len(self.steps)
+        elif frame["op"] == "move":
+            self.position = min(frame["position"], len(self.steps))
+        self._frames += 1
+
+    def refresh(self):
+        # Apply the frames other sessions appended since the last read
+        if self._log is None:
+            return
+        replaced, frames = self._log.read()
+        if replaced:
+            self.blobs, self.steps, self.position, self._frames = {}, [], 0, 0
+        for frame in frames:
+            self._apply_frame(frame)
+
+    def _append(self, frame):
+        self._apply_frame(frame)
+        if self._log is None:
+            return
+        self._log.append([frame])
+        if self._frames > 2 * len(self.steps) + 50:
+            self.compact()
+
+    def compact(self):
+        # Rewrite the log with only the live steps and the blobs they use
+        live = {d for step in self.steps for d in step["sections"].values()}
+        self.blobs = {d: b for d, b in self.blobs.items() if d in live}
+        frames = [self._step_frame(i, step, {} if i else self.blobs) for i, step in enumerate(self.steps)]
+        frames.append({"op": "move", "position": self.position})
+        if self._log is not None:
+            self._log.rewrite(frames)
+        self._frames = len(frames)
+
+    # --- Steps ---
+    def _state(self, step):
+        return {
+            name: srsly.msgpack_loads(zlib.decompress(self.blobs[digest]))
+            for name, digest in step["sections"].items()
+        }
+
+    def record(self, label, data):
+        self.refresh()
+        sections, new_blobs = {}, {}
+        for name, value in data.items():
+            if name in IGNORED_SECTIONS:
+                continue
+            raw = srsly.msgpack_dumps(value)
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            sections[name] = digest
+            if digest not in self.blobs and digest not in new_blobs:
+                new_blobs[digest] = zlib.compress(raw)
+        if self.position and self.steps[self.position - 1]["sections"] == sections:
+            return False
+        step = {"label": label, "time": time.time(), "sections": sections}
+        self._append(self._step_frame(self.position, step, new_blobs))
+        return True
+
+    @property
+    def can_undo(self):
+        return self.position > 1
+
+    @property
+    def can_redo(self):
+        return self.position < len(self.steps)
+
+    def undo_label(self):
+        return self.steps[self.position - 1]["label"] if self.can_undo else None
+
+    def redo_label(self):
+        return self.steps[self.position]["label"] if self.can_redo else None
+
+    def undo(self):
+        self.refresh()
+        if not self.can_undo:
+            return None
+        self._append({"op": "move", "position": self.position - 1})
+        return self._state(self.steps[self.position - 1])
+
+    def redo(self):
+        self.refresh()
+        if not self.can_redo:
+            return None
+        self._append({"op": "move", "position": self.position + 1})
+        return self._state(self.steps[self.position - 1])
+
+
+# --- Chunked lists ---
+def chunk_sections(name, items, key):
+    # Splits a long list into sections "<name> 0", "<name> 1", ... for record(). A chunk ends
+    # after an item whose key hashes to a boundary, so adding or removing an item only changes
+    # the chunk it is in and the other chunks keep sharing their blobs with earlier steps.
+    sections, chunk = {}, []
+    for item in items:
+        chunk.append(item)
+        if zlib.crc32(key(item).encode("utf-8")) % CHUNK_BOUNDARY == 0:
+            sections[f"{name} {len(sections)}"] = chunk
+            chunk = []
+    if chunk:
+        sections[f"{name} {len(sections)}"] = chunk
+    return sections
+
+
+def join_chunks(state, name):
+    indices = sorted(int(key.rpartition(" ")[2]) for key in state if key.rpartition(" ")[0] == name)
+    return [item for i in indices for item in state[f"{name} {i}"]]
+
+
+# --- Summary saves ---
+def save_recorded(history, json_path, data, base=None, force=False, label="Save"):
+    # One lock across the save and its history steps, so concurrent saves are recorded in the
+    # order they reached the disk and each step is the (merged) summary that was written
+    with summary_lock(json_path):
+        if not history.steps and Path(json_path).exists():
+            # First recorded save: keep the state it replaces so it can be undone
+            history.record("Loaded", load_summary(json_path))
+        saved, base = save_summary(json_path, data, base, force, locked=True)
+        history.record(label, saved)
+    return saved, base
+
+
+def restore_recorded(history, json_path, move, move_back, base=None):
+    # Undo/redo: the history move and the save of the state it returns share one lock as well
+    with summary_lock(json_path):
+        state = move(history)
+        if state is None:
+            return None
+        try:
+            return save_summary(json_path, state, base, locked=True)
+        except SaveConflict:
+            move_back(history)
+            raise
@@ -0,0 +1,77 @@
+# patent_core/markers.py
+
+from patent_core.reachability import ReachabilityIndex
+from patent_core.graph import graph_from_network_data
+
+# Upper bound on listed branches per head; the reachability index counts them up front
+MAX_BRANCHES = 1000
+
+
+def find_head_nodes(G, index):
+    return [node for node in G.nodes if index.is_head(node)]
+
+
+def find_all_branches(G, start_node, limit=None):
+    branches = []
+    def dfs(path):
+        node = path[-1]
+        for neighbor in G.neighbors(node):
+            if limit is not None and len(branches) >= limit:
+                return
+            if neighbor not in path:
+                dfs(path + [neighbor])
+        if len(path) > 1 and (limit is None or len(branches) < limit):
+            branches.append(path)
+    dfs([start_node])
+    return branches
+
+
+def generate_markers(network_data, G=None, index=None, limit=MAX_BRANCHES):
+    # Returns the Markers section and {head: branch count or None} for heads cut off at `limit`
+    if G is None:
+        G = graph_from_network_data(network_data)
+    if index is None:
+        index = ReachabilityIndex.from_network_data(network_data)
+    head_nodes = find_head_nodes(G, index)
+    combinations = [node['id'] for node in network_data.get("nodes", [])]
+    branches_info, truncated = {}, {}
+    for head in head_nodes:
+        if not index.has_descendants(head):
+            continue
+        count = index.branch_count(head)
+        branches = find_all_branches(G, head, limit=limit)
+        if count is not None:
+            cut_off = count > limit
+        else:
+            # A cycle is reachable, so only the enumeration hitting the limit tells
+            cut_off = len(branches) >= limit
+        if cut_off:
+            truncated[head] = count
+        branches_info[head] = [
+            f"10UG ({', '.join(branch)})"
+            for branch in branches if len(branch) > 1
+        ]
+    markers = {
+        "Combinations": combinations,
+        "Heads": head_nodes,
+        "Branches": branches_info
+    }
+    return markers, truncated
+
+
+def generate_markers_dict(network_data, G=None, index=None):
+    return generate_markers(network_data, G, index)[0]
+
+
+def format_markers_for_display(markers_dict):
+    text = ""
+    for key, value in markers_dict.items():
+        text += f"{key}\n\n"
+        if isinstance(value, list):
+            text += "\n".join(value) + "\n"
+        elif isinstance(value, dict):
+            for head, branches in value.items():
+                text += f"{head}:\n"
+                text += "\n".join(branches) + "\n"
+        text += "\n---   ---   ---   --- \n\n"
+    return text.strip()
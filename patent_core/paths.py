@@ -0,0 +1,36 @@
+# patent_core/paths.py
+
+import re
+import uuid
+import unicodedata
+from pathlib import Path
+
+DATA_DIR = Path("data")
+
+
+# ✅ Secure filename generator
+def secure_filename(value: str, allow_uuid_suffix: bool = False) -> str:
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    value = re.sub(r"[^\w.\- ]", "", value)
+    value = re.sub(r"\s+", "_", value).strip("._")
+    if not value:
+        value = "file"
+    if allow_uuid_suffix:
+        value += f"_{uuid.uuid4().hex[:6]}"
+    return value
+
+
+def summary_dir(filename, data_dir=DATA_DIR):
+    return Path(data_dir) / filename
+
+
+def summary_json_path(filename, data_dir=DATA_DIR):
+    return summary_dir(filename, data_dir) / f"Summary_{filename}.json"
+
+
+def summary_docx_path(filename, data_dir=DATA_DIR):
+    return summary_dir(filename, data_dir) / f"Summary_{filename}.docx"
+
+
+def image_path(filename, data_dir=DATA_DIR):
+    return summary_dir(filename, data_dir) / f"appl_image_{filename}.png"
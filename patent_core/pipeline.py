@@ -0,0 +1,86 @@
+# patent_core/pipeline.py
+
+import sys
+from patent_core.catalog import open_catalog
+from patent_core.history import SummaryHistory, history_path, save_recorded
+from patent_core.storage import read_summary
+from patent_core import extract
+from patent_core.cite import claim_citations
+from patent_core.document import create_word_doc
+from patent_core.graph import graph_from_features, graph_to_network_data
+from patent_core.markers import generate_markers
+from patent_core.paths import DATA_DIR, image_path, summary_docx_path, summary_json_path
+
+STAGES = ["extract", "graph", "markers", "cite", "docx"]
+
+
+class StageError(ValueError):
+    pass
+
+
+# --- Stages (each takes and updates the summary dict) ---
+def run_extract(data, nlp=None, claims_text=None, similarity=None):
+    if claims_text is None:
+        claims_text = "\n".join(data.get("User Entered Claims", {}).values())
+    cleaned_claims = extract.split_claims(claims_text)
+    if not cleaned_claims:
+        raise StageError("No claims to extract features from")
+    nlp = nlp if nlp is not None else extract.load_nlp()
+    features = extract.extract_features(cleaned_claims, nlp)
+
+    # Same rule as the Extract page: keep manual table edits while the claims are unchanged,
+    # unless a merge of near-duplicate spellings was asked for
+    user_claims = {f"Cl_{i+1}": claim for i, claim in enumerate(cleaned_claims)}
+    if data.get("User Entered Claims") == user_claims and data.get("Edited Feature Table") and similarity is None:
+        table = data["Edited Feature Table"]
+    else:
+        table = extract.table_from_frame(extract.create_feature_table(features, len(cleaned_claims), similarity, nlp))
+    data.update(extract.extraction_sections(cleaned_claims, features, table))
+    return data
+
+
+def run_graph(data):
+    network_features = data.get("Concatenated DataFrame", {})
+    if not network_features or not any(network_features.values()):
+        raise StageError("No extracted features; run the extract stage first")
+    data["Network"] = graph_to_network_data(graph_from_features(network_features))
+    return data
+
+
+def run_markers(data):
+    if not data.get("Network"):
+        raise StageError("No network; run the graph stage first")
+    data["Markers"], truncated = generate_markers(data["Network"])
+    return data, truncated
+
+
+def run_cite(data):
+    text = claim_citations(data)
+    if not text:
+        raise StageError("Claim 1 text or its features are missing")
+    return text
+
+
+def run_docx(data, filename, data_dir=DATA_DIR):
+    output_path = summary_docx_path(filename, data_dir)
+    create_word_doc(filename, data, output_path, image_path(filename, data_dir))
+    open_catalog(data_dir).mark_docx(filename)
+    return output_path
+
+
+# --- Summary files ---
+def load(filename, data_dir=DATA_DIR):
+    return read_summary(summary_json_path(filename, data_dir))
+
+
+def save(filename, data, base, label, data_dir=DATA_DIR):
+    # Compare-and-swap save, recorded in the same undo history the app uses
+    json_path = summary_json_path(filename, data_dir)
+    history = SummaryHistory.load(history_path(json_path))
+    saved, base = save_recorded(history, json_path, data, base, label=label)
+    try:
+        open_catalog(data_dir).record(json_path, saved)
+    except Exception as e:
+        # The summary is saved; the catalog catches up on its next rescan
+        print(f"⚠️ Catalog not updated: {e}", file=sys.stderr)
+    return saved, base
@@ -0,0 +1,208 @@
+# patent_core/reachability.py
+
+import numpy as np
+
+_ONE = np.uint64(1)
+
+
+def network_signature(network_data):
+    # Identifies one saved Network so an index can be reused across pages and reruns
+    nodes = frozenset(node["id"] for node in network_data.get("nodes", []))
+    edges = frozenset((edge["source"], edge["target"]) for edge in network_data.get("edges", []))
+    return hash((nodes, edges))
+
+
+class ReachabilityIndex:
+    """Transitive closure of the feature graph stored as one bitset row per node.
+
+    ``reach[i]`` has bit ``j`` set when node ``j`` is reachable from node ``i``.
+    The closure is built once in DFS post-order (successors first) and kept up
+    to date on edits: adding an edge ORs the target's row into every ancestor
+    of the source, removing an edge or node recomputes only the rows of the
+    nodes that could reach it.
+    """
+
+    def __init__(self, nodes=(), edges=()):
+        self.names, self.pos = [], {}
+        self.alive, self.succ, self.pred = [], [], []
+        self.reach = np.zeros((0, 0), dtype=np.uint64)
+        self._branch_counts = {}
+        for node in nodes:
+            self._add_slot(node)
+        for u, v in edges:
+            for node in (u, v):
+                if node not in self.pos:
+                    self._add_slot(node)
+            self.succ[self.pos[u]].add(self.pos[v])
+            self.pred[self.pos[v]].add(self.pos[u])
+        self._recompute(range(len(self.names)))
+
+    @classmethod
+    def from_network_data(cls, network_data):
+        return cls(
+            [node["id"] for node in network_data.get("nodes", [])],
+            [(edge["source"], edge["target"]) for edge in network_data.get("edges", [])]
+        )
+
+    @classmethod
+    def from_graph(cls, G):
+        return cls(list(G.nodes), list(G.edges))
+
+    # --- Bitset helpers ---
+    def _add_slot(self, name):
+        i = len(self.names)
+        rows, words = self.reach.shape
+        if i >= rows or i >= words * 64:
+            # Grow geometrically so repeated add_node stays amortised O(1) in allocations
+            size = max(64, 2 * rows)
+            grown = np.zeros((size, -(-size // 64)), dtype=np.uint64)
+            grown[:rows, :words] = self.reach
+            self.reach = grown
+        self.names.append(name)
+        self.pos[name] = i
+        self.alive.append(True)
+        self.succ.append(set())
+        self.pred.append(set())
+        return i
+
+    def _has_bit(self, row, j):
+        return bool((self.reach[row, j >> 6] >> np.uint64(j & 63)) & _ONE)
+
+    def _bit_positions(self, row):
+        bits = np.unpackbits(self.reach[row].view(np.uint8), bitorder="little")[:len(self.names)]
+        return [j for j in np.flatnonzero(bits).tolist() if self.alive[j]]
+
+    def _ancestor_positions(self, j):
+        column = (self.reach[:len(self.names), j >> 6] >> np.uint64(j & 63)) & _ONE
+        return [i for i in np.flatnonzero(column).tolist() if self.alive[i]]
+
+    def _postorder(self, rows):
+        rows = set(rows)
+        order, visited = [], set()
+        for root in sorted(rows):
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(self.succ[root]))]
+            while stack:
+                node, children = stack[-1]
+                child = next((c for c in children if c in rows and c not in visited), None)
+                if child is None:
+                    order.append(node)
+                    stack.pop()
+                else:
+                    visited.add(child)
+                    stack.append((child, iter(self.succ[child])))
+        return order
+
+    def _recompute(self, rows):
+        # Rows outside `rows` are assumed correct; cycles converge after extra passes
+        order = self._postorder(rows)
+        self.reach[order] = 0
+        changed = True
+        while changed:
+            changed = False
+            for i in order:
+                row = self.reach[i].copy()
+                for s in self.succ[i]:
+                    row |= self.reach[s]
+                    row[s >> 6] |= _ONE << np.uint64(s & 63)
+                if not np.array_equal(row, self.reach[i]):
+                    self.reach[i] = row
+                    changed = True
+        self._branch_counts.clear()
+
+    # --- Updates ---
+    def add_node(self, name):
+        if name not in self.pos:
+            self._add_slot(name)
+            self._branch_counts.clear()
+
+    def add_edge(self, u, v):
+        for name in (u, v):
+            self.add_node(name)
+        i, j = self.pos[u], self.pos[v]
+        if j in self.succ[i]:
+            return
+        self.succ[i].add(j)
+        self.pred[j].add(i)
+        gained = self.reach[j].copy()
+        gained[j >> 6] |= _ONE << np.uint64(j & 63)
+        self.reach[[i, *self._ancestor_positions(i)]] |= gained
+        self._branch_counts.clear()
+
+    def remove_edge(self, u, v):
+        i, j = self.pos[u], self.pos[v]
+        self.succ[i].discard(j)
+        self.pred[j].discard(i)
+        self._recompute({i, *self._ancestor_positions(i)})
+
+    def remove_node(self, name):
+        i = self.pos.pop(name)
+        affected = set(self._ancestor_positions(i))
+        for p in self.pred[i]:
+            self.succ[p].discard(i)
+        for s in self.succ[i]:
+            self.pred[s].discard(i)
+        self.succ[i], self.pred[i] = set(), set()
+        self.alive[i] = False
+        self.reach[i] = 0
+        affected.discard(i)
+        self._recompute(affected)
+
+    # --- Queries ---
+    def __contains__(self, name):
+        return name in self.pos
+
+    def signature(self):
+        # Same value as network_signature() for the graph the index currently holds
+        nodes = frozenset(self.pos)
+        edges = frozenset(
+            (self.names[i], self.names[j])
+            for i, targets in enumerate(self.succ) if self.alive[i] for j in targets
+        )
+        return hash((nodes, edges))
+
+    def heads(self):
+        return [n for i, n in enumerate(self.names) if self.alive[i] and not self.pred[i]]
+
+    def is_head(self, name):
+        return not self.pred[self.pos[name]]
+
+    def reaches(self, u, v):
+        return self._has_bit(self.pos[u], self.pos[v])
+
+    def descendants(self, name):
+        return [self.names[j] for j in self._bit_positions(self.pos[name])]
+
+    def has_descendants(self, name):
+        return bool(self.succ[self.pos[name]])
+
+    def heads_reaching(self, name):
+        j = self.pos[name]
+        return [head for head in self.heads() if self._has_bit(self.pos[head], j)]
+
+    def on_cycle(self, name):
+        i = self.pos[name]
+        return self._has_bit(i, i)
+
+    def branch_count(self, head):
+        """Number of paths with at least two nodes starting at head.
+
+        Matches the branches enumerated by the Markers page. Returns None when
+        a cycle is reachable from head, since paths are then not countable by
+        dynamic programming.
+        """
+        if head in self._branch_counts:
+            return self._branch_counts[head]
+        i = self.pos[head]
+        reachable = [i, *self._bit_positions(i)]
+        if any(self._has_bit(r, r) for r in reachable):
+            count = None
+        else:
+            paths = {}
+            for r in self._postorder(reachable):
+                paths[r] = 1 + sum(paths[s] for s in self.succ[r])
+            count = paths[i] - 1
+        self._branch_counts[head] = count
+        return count
@@ -0,0 +1,80 @@
+# patent_core/segmenter.py
+
+import re
+
+# Segments are kept well below spaCy's default max_length (1,000,000 chars),
+# so a pasted description never reaches the parser as a single Doc.
+MAX_SEGMENT_CHARS = 5000
+
+# Clause boundaries in claim language: cut after ";" and "comprising:",
+# and before "wherein".
+_CLAUSE_BOUNDARY = re.compile(r";\s*|\bcomprising:\s*|\s+(?=wherein\b)", re.IGNORECASE)
+_PAREN_OR_SPACE = re.compile(r"\s*(?:\([^)]*\)\s*)+|\s+")
+_PARENS = re.compile(r"\([^)]*\)")
+
+
+# --- Cleaning ---
+def remove_parenthesized_text(claim):
+    # Single pass: drop "(...)" groups and collapse whitespace at the same time
+    def replacement(match):
+        # Whitespace anywhere outside the removed groups ("valve(3) (4)body") leaves one space
+        return " " if _PARENS.sub("", match.group(0)) else ""
+
+    return _PAREN_OR_SPACE.sub(replacement, claim).strip()
+
+
+# --- Segmenting ---
+def _hard_split(text, start, end, max_chars):
+    # Fallback for a single clause longer than max_chars: cut at the last space
+    while end - start > max_chars:
+        cut = text.rfind(" ", start + 1, start + max_chars)
+        if cut == -1:
+            cut = start + max_chars
+        yield start, cut
+        start = cut
+    yield start, end
+
+
+def iter_segments(text, max_chars=MAX_SEGMENT_CHARS):
+    """Yield (segment, offset) pairs covering text, split at clause boundaries.
+
+    The pairs match spaCy's ``nlp.pipe(..., as_tuples=True)`` convention, so
+    segments can be parsed one at a time and offsets mapped back to the text.
+    """
+    if len(text) <= max_chars:
+        if text:
+            yield text, 0
+        return
+
+    start = last_cut = 0
+    spans = []
+    for match in _CLAUSE_BOUNDARY.finditer(text):
+        pos = match.end()
+        if pos - start > max_chars:
+            if last_cut > start:
+                spans.append((start, last_cut))
+                start = last_cut
+            if pos - start > max_chars:
+                *head, (start, _) = _hard_split(text, start, pos, max_chars)
+                spans.extend(head)
+        last_cut = pos
+        for seg_start, seg_end in spans:
+            yield text[seg_start:seg_end], seg_start
+        spans.clear()
+
+    if len(text) - start > max_chars and last_cut > start:
+        yield text[start:last_cut], start
+        start = last_cut
+    for seg_start, seg_end in _hard_split(text, start, len(text), max_chars):
+        if seg_end > seg_start:
+            yield text[seg_start:seg_end], seg_start
+
+
+def iter_article_pairs(text):
+    # Lazily walk "a/an/the <word>" pairs without splitting the whole text
+    previous = None
+    for match in re.finditer(r"\S+", text):
+        word = match.group(0)
+        if previous is not None and previous.lower() in {"a", "an", "the"} and word.isalpha():
+            yield f"{previous} {word}"
+        previous = word
@@ -0,0 +1,150 @@
+# patent_core/snapshot.py
+
+import argparse
+import json
+import mmap
+import struct
+import zlib
+from pathlib import Path
+import srsly
+
+# File layout:
+#   MAGIC | <H format version> <I header length> | header | section blobs
+# The header is a msgpack map with the schema version, an ordered offset
+# table [[name, offset, length], ...] (offsets are relative to the first blob)
+# and optionally the [mtime_ns, size] stamp of the JSON file it was written from.
+# Every section is msgpack-encoded and zlib-compressed on its own, so one
+# section can be decoded without touching the others.
+MAGIC = b"PATSNAP\0"
+FORMAT_VERSION = 1
+SCHEMA_VERSION = 1
+COMPRESSION_LEVEL = 6
+_PREFIX = struct.Struct("<HI")
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+# --- Writing ---
+def dumps_snapshot(data, schema_version=SCHEMA_VERSION, source_stamp=None):
+    blobs, table, offset = [], [], 0
+    for name, value in data.items():
+        blob = zlib.compress(srsly.msgpack_dumps(value), COMPRESSION_LEVEL)
+        table.append([name, offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+    header = {"schema": schema_version, "sections": table}
+    if source_stamp is not None:
+        header["source"] = list(source_stamp)
+    header = srsly.msgpack_dumps(header)
+    return b"".join([MAGIC, _PREFIX.pack(FORMAT_VERSION, len(header)), header, *blobs])
+
+
+def write_snapshot(path, data, source_stamp=None):
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(dumps_snapshot(data, source_stamp=source_stamp))
+    tmp_path.replace(path)
+
+
+# --- Reading ---
+class Snapshot:
+    """Lazy reader over a snapshot file (memory-mapped) or an in-memory buffer.
+
+    Only the offset table is parsed on open; ``read`` decompresses and
+    decodes a single section on demand.
+    """
+
+    def __init__(self, buffer, _file=None):
+        self._file = _file
+        self._buffer = buffer
+        with memoryview(buffer) as view:
+            if bytes(view[:len(MAGIC)]) != MAGIC:
+                raise SnapshotError("Not a summary snapshot")
+            start = len(MAGIC) + _PREFIX.size
+            self.format_version, header_len = _PREFIX.unpack(view[len(MAGIC):start])
+            if self.format_version > FORMAT_VERSION:
+                raise SnapshotError(f"Unsupported snapshot format version {self.format_version}")
+            header = srsly.msgpack_loads(bytes(view[start:start + header_len]))
+        self.schema_version = header["schema"]
+        # Sections of another schema would be decoded as if they were current; no migrations exist yet
+        if self.schema_version != SCHEMA_VERSION:
+            raise SnapshotError(f"Unsupported summary schema version {self.schema_version}")
+        self.source_stamp = header.get("source")
+        self._data_start = start + header_len
+        self._table = {name: (offset, length) for name, offset, length in header["sections"]}
+
+    @classmethod
+    def open(cls, path):
+        f = open(path, "rb")
+        try:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), _file=f)
+        except Exception:
+            f.close()
+            raise
+
+    @property
+    def sections(self):
+        return list(self._table)
+
+    def __contains__(self, name):
+        return name in self._table
+
+    def read(self, name, default=None):
+        if name not in self._table:
+            return default
+        offset, length = self._table[name]
+        start = self._data_start + offset
+        return srsly.msgpack_loads(zlib.decompress(self._buffer[start:start + length]))
+
+    def to_dict(self):
+        return {name: self.read(name) for name in self._table}
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def loads_snapshot(raw):
+    with Snapshot(raw) as snap:
+        return snap.to_dict()
+
+
+def read_sections(path, names):
+    with Snapshot.open(path) as snap:
+        return {name: snap.read(name) for name in names if name in snap}
+
+
+# --- JSON conversion ---
+def json_to_snapshot(json_path, snapshot_path):
+    with open(json_path, "r", encoding="utf-8") as f:
+        write_snapshot(snapshot_path, json.load(f))
+
+
+def snapshot_to_json(snapshot_path, json_path):
+    with Snapshot.open(snapshot_path) as snap:
+        data = snap.to_dict()
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert between Summary JSON and binary snapshots.")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args()
+
+    if args.source.endswith(".json"):
+        json_to_snapshot(args.source, args.target)
+    else:
+        snapshot_to_json(args.source, args.target)
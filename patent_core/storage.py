@@ -0,0 +1,185 @@
+# patent_core/storage.py
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from patent_core.compact_state import summary_to_dict
+from patent_core.snapshot import Snapshot, SnapshotError, write_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Monotonic per-summary revision, bumped by every save
+REVISION_KEY = "Revision"
+
+
+class SaveConflict(Exception):
+    def __init__(self, sections):
+        self.sections = sections
+        super().__init__(f"Sections changed by someone else since you loaded them: {', '.join(sections)}")
+
+
+def snapshot_path(json_path):
+    return Path(json_path).with_suffix(".snap")
+
+
+# --- Locking ---
+@contextmanager
+def summary_lock(json_path):
+    # Advisory lock on a sidecar file, held only for the read-compare-write of a save
+    lock_path = Path(json_path).with_suffix(".lock")
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# --- Versioning ---
+def file_stamp(json_path):
+    try:
+        stat = os.stat(json_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _digest(value):
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def section_digests(data):
+    return {key: _digest(data[key]) for key in data if key != REVISION_KEY}
+
+
+def summary_base(json_path, data, stamp=None):
+    # What a session last read or wrote: used to detect changes and to merge on save
+    return {
+        "path": str(json_path),
+        "stamp": stamp if stamp is not None else file_stamp(json_path),
+        "revision": data.get(REVISION_KEY, 0),
+        "digests": section_digests(data),
+    }
+
+
+def has_changed(json_path, base):
+    return base is None or base["path"] != str(json_path) or base["stamp"] != file_stamp(json_path)
+
+
+def merge_sections(mine, theirs, base_digests=None):
+    # Three-way merge per top-level section; only sections changed on both sides conflict.
+    # Without base digests there is nothing to tell a deletion from a section added on disk,
+    # so our sections win and sections only on disk are kept.
+    merged, conflicts = {}, []
+    for key in dict.fromkeys([*theirs, *mine]):
+        if key == REVISION_KEY:
+            continue
+        if base_digests is None:
+            mine_changed = key in mine
+        else:
+            base = base_digests.get(key)
+            mine_digest = _digest(mine[key]) if key in mine else None
+            theirs_digest = _digest(theirs[key]) if key in theirs else None
+            mine_changed = mine_digest != base
+            if mine_changed and theirs_digest != base and mine_digest != theirs_digest:
+                conflicts.append(key)
+        source = mine if mine_changed else theirs
+        if key in source:
+            merged[key] = source[key]
+    return merged, conflicts
+
+
+# --- Reading ---
+def load_summary(json_path, sections=None):
+    # Decodes only the requested sections when the snapshot was written from the current JSON.
+    # The JSON stamp stored in the snapshot must match exactly: mtimes alone are not enough once
+    # files are restored with their old times (cp -p, rsync, unzip) or timestamps are coarse.
+    json_path = Path(json_path)
+    snap_path = snapshot_path(json_path)
+    stamp = file_stamp(json_path)
+    snap = None
+    if snap_path.exists():
+        try:
+            snap = Snapshot.open(snap_path)
+        except SnapshotError:
+            # Another schema: the JSON is canonical, and the next save rewrites the snapshot
+            if stamp is None:
+                raise
+    if snap is not None:
+        with snap:
+            if stamp is None or snap.source_stamp == list(stamp):
+                if sections is None:
+                    return snap.to_dict()
+                return {name: snap.read(name) for name in sections if name in snap}
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if sections is None:
+        return data
+    return {name: data[name] for name in sections if name in data}
+
+
+def read_summary(json_path):
+    # Returns the summary and the base to pass back to save_summary
+    stamp = file_stamp(json_path)
+    data = load_summary(json_path)
+    return data, summary_base(json_path, data, stamp)
+
+
+# --- Writing ---
+def _write_files(json_path, data):
+    # JSON stays the canonical file; the snapshot next to it is written for lazy section loading
+    tmp_path = json_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    tmp_path.replace(json_path)
+    write_snapshot(snapshot_path(json_path), data, file_stamp(json_path))
+
+
+def save_summary(json_path, data, base=None, force=False, locked=False):
+    """Compare-and-swap save of a summary.
+
+    If the file is unchanged since ``base`` was taken, ``data`` is written as
+    is. Otherwise sections that only one side changed are merged, and
+    ``SaveConflict`` is raised when both sides changed the same section.
+    ``force`` skips the check and overwrites. ``locked`` means the caller
+    already holds ``summary_lock`` (taking it again would deadlock). Returns
+    the saved summary and the new base.
+    """
+    json_path = Path(json_path)
+    data = summary_to_dict(data)
+    with nullcontext() if locked else summary_lock(json_path):
+        stamp = file_stamp(json_path)
+        disk_revision = 0
+        if stamp is not None and not force:
+            if base is not None and base["path"] == str(json_path) and base["stamp"] == stamp:
+                disk_revision = base["revision"]
+            else:
+                theirs = load_summary(json_path)
+                disk_revision = theirs.get(REVISION_KEY, 0)
+                base_digests = base["digests"] if base and base["path"] == str(json_path) else None
+                data, conflicts = merge_sections(data, theirs, base_digests)
+                if conflicts:
+                    raise SaveConflict(conflicts)
+        elif stamp is not None:
+            disk_revision = load_summary(json_path, [REVISION_KEY]).get(REVISION_KEY, 0)
+
+        data[REVISION_KEY] = max(disk_revision, data.get(REVISION_KEY, 0)) + 1
+        _write_files(json_path, data)
+        base = summary_base(json_path, data)
+    return data, base
@@ -0,0 +1,86 @@
+# session.py
+
+import streamlit as st
+from patent_core.catalog import open_catalog
+from patent_core.compact_state import compact_summary
+from patent_core.history import SummaryHistory, history_path, restore_recorded, save_recorded
+from patent_core.paths import DATA_DIR
+from patent_core.storage import SaveConflict, has_changed, read_summary, save_summary
+
+# Page state derived from summary_data; stale once the summary is replaced by a reload or Undo/Redo
+PAGE_CACHE_KEYS = ("edited_feature_table", "G", "G_source", "reach_index")
+
+
+def _drop_page_caches():
+    for key in PAGE_CACHE_KEYS:
+        st.session_state.pop(key, None)
+
+
+def load_session_summary(json_path):
+    # Re-parse only when the file changed since this session last read or wrote it
+    base = st.session_state.get("summary_base")
+    if "summary_data" in st.session_state and not has_changed(json_path, base):
+        return st.session_state["summary_data"]
+    data, base = read_summary(json_path)
+    _drop_page_caches()
+    st.session_state["summary_data"] = compact_summary(data)
+    st.session_state["summary_base"] = base
+    return st.session_state["summary_data"]
+
+
+def get_history(json_path):
+    history = st.session_state.get("summary_history")
+    if history is None or history.path != history_path(json_path):
+        history = SummaryHistory.load(history_path(json_path))
+        st.session_state["summary_history"] = history
+    else:
+        history.refresh()
+    return history
+
+
+def _conflict_error(e):
+    st.error(f"❌ Not saved. {e}. Reload the application on the main page and redo your changes.")
+
+
+def _store_saved(json_path, saved, base):
+    st.session_state["summary_data"] = compact_summary(saved)
+    st.session_state["summary_base"] = base
+    try:
+        open_catalog(DATA_DIR).record(json_path, saved)
+    except Exception as e:
+        st.warning(f"⚠️ Saved, but the application catalog was not updated: {e}. Use '🔄 Rescan data folder' on the main page.")
+
+
+def save_session_summary(json_path, data, force=False, label="Save", record=True):
+    base = st.session_state.get("summary_base")
+    try:
+        if record:
+            saved, base = save_recorded(get_history(json_path), json_path, data, base, force, label)
+        else:
+            saved, base = save_summary(json_path, data, base, force)
+    except SaveConflict as e:
+        _conflict_error(e)
+        return False
+    _store_saved(json_path, saved, base)
+    return True
+
+
+def _restore(json_path, move, move_back):
+    try:
+        restored = restore_recorded(get_history(json_path), json_path, move, move_back, st.session_state.get("summary_base"))
+    except SaveConflict as e:
+        _conflict_error(e)
+        return False
+    if restored is None:
+        return False
+    _store_saved(json_path, *restored)
+    _drop_page_caches()
+    return True
+
+
+def undo_summary(json_path):
+    return _restore(json_path, SummaryHistory.undo, SummaryHistory.redo)
+
+
+def redo_summary(json_path):
+    return _restore(json_path, SummaryHistory.redo, SummaryHistory.undo)
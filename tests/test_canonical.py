@@ -0,0 +1,31 @@
+# tests/test_canonical.py
+
+from patent_core.canonical import FeatureIndex, canonical_key
+
+
+def test_singular_and_plural_share_a_key():
+    for singular, plural in [
+        ("a gas", "the gases"), ("a lens", "the lenses"), ("an axis", "the axes"),
+        ("a case", "the cases"), ("a valve", "the valves"), ("a body", "the bodies"),
+        ("a box", "the boxes"), ("a class", "the classes"), ("a branch", "the branches"),
+    ]:
+        assert canonical_key(singular) == canonical_key(plural)
+
+
+def test_similarity_merges_typos_only():
+    def merged(a, b):
+        index = FeatureIndex([a, b], similarity=0.9)
+        return index.ids[a] == index.ids[b]
+
+    assert merged("a sealing member", "a sealng member")
+    assert merged("a container", "a contaner")
+    assert not merged("a drive shaft", "a driven shaft")
+    assert not merged("a valve body", "a valve seat")
+    assert not merged("a first plate", "a second plate")
+    assert not merged("an inlet valve", "an outlet valve")
+
+
+def test_canonical_name_prefers_introduction():
+    index = FeatureIndex(["the seals", "a seal", "said seal"])
+    assert len(index) == 1
+    assert index.canonical("the seals") == "a seal"
@@ -0,0 +1,84 @@
+# tests/test_compact_state.py
+
+import json
+from array import array
+from pathlib import Path
+from patent_core import compact_state
+from patent_core.compact_state import CompactGraph, CompactSummary, summary_to_dict
+
+EP1 = Path(__file__).resolve().parent.parent / "data" / "EP1" / "Summary_EP1.json"
+
+
+def test_summary_round_trip_is_lossless():
+    with open(EP1, encoding="utf-8") as f:
+        data = json.load(f)
+    assert json.dumps(summary_to_dict(CompactSummary(data))) == json.dumps(data)
+
+
+def test_reordered_edited_feature_table_keeps_its_order():
+    data = {
+        "Feature Table": {"Cl_1": ["a valve"], "Cl_2": ["a lever"]},
+        "Edited Feature Table": {"Cl_2": ["a lever"], "Cl_1": ["a valve"]},
+    }
+    assert list(CompactSummary(data)["Edited Feature Table"]) == ["Cl_2", "Cl_1"]
+
+
+def test_edited_table_only_stores_claims_that_differ_from_the_extractor_default():
+    data = {
+        "Feature Table": {
+            "Cl_1": ["a valve", "the apparatus", "the valve", "two seals"],
+            "Cl_2": ["the valves", "a lever"],
+        },
+        "Edited Feature Table": {"Cl_1": ["a valve", "the apparatus", "two seals"], "Cl_2": ["a lever"]},
+    }
+    summary = CompactSummary(data)
+    assert summary.features.edited is None
+    assert summary["Edited Feature Table"] == data["Edited Feature Table"]
+
+    data["Edited Feature Table"]["Cl_2"] = ["a lever", "a spring"]
+    summary = CompactSummary(data)
+    assert list(summary.features.edited) == ["Cl_2"]
+    assert summary_to_dict(summary) == data
+
+
+def test_graph_edits_keep_lookups_consistent():
+    graph = CompactGraph()
+    for n in "abcd":
+        graph.add_node(n)
+    graph.add_edge("a", "b", "x")
+    graph.add_edge("b", "c")
+    graph.add_edge("c", "d")
+    graph.remove_node("b")
+    graph.add_edge("a", "d", "y")
+    graph.add_edge("c", "d", "z")
+    graph.remove_edge("c", "d")
+    assert "b" not in graph and "d" in graph
+    assert graph.to_network_data()["edges"] == [{"source": "a", "target": "d", "label": "y"}]
+    assert graph.node_color("d") == "lightblue"
+
+
+class ScanCountingArray(array):
+    # Counts every pass over the array, so the test does not depend on machine speed
+    scans = 0
+
+    def __iter__(self):
+        ScanCountingArray.scans += 1
+        return super().__iter__()
+
+    def __contains__(self, value):
+        ScanCountingArray.scans += 1
+        return super().__contains__(value)
+
+    def index(self, *args):
+        ScanCountingArray.scans += 1
+        return super().index(*args)
+
+
+def test_graph_build_does_not_scan_the_arrays(monkeypatch):
+    monkeypatch.setattr(compact_state, "array", ScanCountingArray)
+    ScanCountingArray.scans = 0
+    nodes = [{"id": f"n{i}", "color": "red"} for i in range(500)]
+    edges = [{"source": f"n{i}", "target": f"n{i + 1}", "label": ""} for i in range(499)]
+    graph = CompactGraph.from_network_data({"nodes": nodes, "edges": edges})
+    assert ScanCountingArray.scans == 0
+    assert len(graph.edges) == 499
@@ -0,0 +1,49 @@
+# tests/test_history.py
+
+import threading
+from patent_core.history import SummaryHistory, chunk_sections, history_path, join_chunks, save_recorded
+from patent_core.storage import load_summary
+
+
+def _graph_state(nodes):
+    return chunk_sections("nodes", [{"id": n, "color": "red"} for n in nodes], lambda node: node["id"])
+
+
+def test_chunked_edit_only_stores_the_changed_chunk():
+    nodes = [f"a feature {i}" for i in range(2000)]
+    history = SummaryHistory()
+    history.record("Build", _graph_state(nodes))
+    blobs = len(history.blobs)
+    assert blobs > 10
+
+    edited = nodes[:1000] + nodes[1001:] + ["a new feature"]
+    history.record("Del Node", _graph_state(edited))
+    assert len(history.blobs) - blobs <= 4
+
+    assert [n["id"] for n in join_chunks(history.undo(), "nodes")] == nodes
+    assert [n["id"] for n in join_chunks(history.redo(), "nodes")] == edited
+
+
+def test_concurrent_saves_record_what_reached_the_disk(tmp_path):
+    json_path = tmp_path / "EP1" / "Summary_EP1.json"
+    json_path.parent.mkdir()
+
+    def session(n):
+        history = SummaryHistory.load(history_path(json_path))
+        for i in range(5):
+            save_recorded(history, json_path, {f"Section {n}": i}, label=f"Save {n}")
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    history = SummaryHistory.load(history_path(json_path))
+    on_disk = {k: v for k, v in load_summary(json_path).items() if k != "Revision"}
+    assert on_disk == {f"Section {n}": 4 for n in range(6)}
+    assert history._state(history.steps[-1]) == on_disk
+    # Every step is a summary that was on disk: sections only ever move forward
+    for before, after in zip(history.steps, history.steps[1:]):
+        before, after = history._state(before), history._state(after)
+        assert all(after.get(k, -1) >= v for k, v in before.items())
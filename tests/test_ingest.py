@@ -0,0 +1,54 @@
+# tests/test_ingest.py
+
+import io
+import json
+from ingest import ingest_dump, iter_text_applications, iter_xml_applications
+from patent_core.catalog import Catalog
+
+XML_DUMP = """<?xml version="1.0"?>
+<ep-patent-document id="EP1000001A1">
+<claims lang="en"><claim num="0001"><claim-text>A vessel for CO<sub>2</sub> with a <b>lever</b>.</claim-text></claim></claims>
+</ep-patent-document>
+<?xml version="1.0"?>
+<ep-patent-document id="EP1000002A1">
+<claims lang="en"><claim num="0001"><claim-text>1. A valve comprising:<claim-text>a housing;</claim-text><claim-text>a <i>lid</i>.</claim-text></claim-text></claim></claims>
+</ep-patent-document>
+"""
+
+
+def test_xml_inline_markup_adds_no_spaces_but_clauses_stay_apart():
+    applications = list(iter_xml_applications(io.StringIO(XML_DUMP)))
+    assert applications == [
+        ("EP1000001A1", ["1. A vessel for CO2 with a lever."]),
+        ("EP1000002A1", ["1. A valve comprising: a housing; a lid."]),
+    ]
+
+
+def test_text_headers_split_applications():
+    dump = "EP 1 234 567\n1. A valve.\n\n2. The valve of claim 1.\nEP7654321\n1. A lever.\n"
+    assert list(iter_text_applications(io.StringIO(dump))) == [
+        ("EP1234567", ["1. A valve.", "2. The valve of claim 1."]),
+        ("EP7654321", ["1. A lever."]),
+    ]
+
+
+def test_text_without_header_uses_fallback(tmp_path):
+    dump = tmp_path / "claims_test.txt"
+    dump.write_text("1. A valve\ncomprising a body.\n\n2. The valve of claim 1.\n", encoding="utf-8")
+    assert ingest_dump(dump, tmp_path / "data") == (1, 0)
+    with open(tmp_path / "data" / "claims_test" / "Summary_claims_test.json", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["User Entered Claims"] == {"Cl_1": "1. A valve comprising a body.", "Cl_2": "2. The valve of claim 1."}
+
+    assert ingest_dump(dump, tmp_path / "data", publication="EP1") == (1, 0)
+    assert (tmp_path / "data" / "EP1" / "Summary_EP1.json").exists()
+
+
+def test_ingested_summaries_are_in_the_catalog(tmp_path):
+    dump = tmp_path / "dump.xml"
+    dump.write_text(XML_DUMP, encoding="utf-8")
+    assert ingest_dump(dump, tmp_path / "data") == (2, 0)
+    # A fresh reader, as another process would open it
+    catalog = Catalog(tmp_path / "data")
+    catalog.refresh()
+    assert [(name, entry["claims"]) for name, entry in catalog.search("ep")] == [("EP1000001A1", 1), ("EP1000002A1", 1)]
@@ -0,0 +1,64 @@
+# tests/test_reachability.py
+
+import random
+from patent_core.reachability import ReachabilityIndex
+
+
+def _descendants(edges, node):
+    seen, stack = set(), [node]
+    while stack:
+        for u, v in edges:
+            if u == stack[-1] and v not in seen:
+                seen.add(v)
+                stack.append(v)
+                break
+        else:
+            stack.pop()
+    return seen
+
+
+def _branch_count(edges, head):
+    # Paths of at least two nodes from head; None when a cycle is reachable
+    reachable = {head} | _descendants(edges, head)
+    if any(n in _descendants(edges, n) for n in reachable):
+        return None
+
+    def paths(node):
+        return sum(1 + paths(v) for u, v in edges if u == node)
+    return paths(head)
+
+
+def _check(index, nodes, edges):
+    heads = [n for n in nodes if not any(v == n for _, v in edges)]
+    assert sorted(index.heads()) == sorted(heads)
+    for node in nodes:
+        assert set(index.descendants(node)) == _descendants(edges, node)
+        assert set(index.heads_reaching(node)) == {h for h in heads if node in _descendants(edges, h)}
+    for head in heads:
+        assert index.branch_count(head) == _branch_count(edges, head)
+
+
+def test_incremental_edits_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(60):
+        nodes = [f"n{i}" for i in range(rng.randint(2, 10))]
+        edges = {(u, v) for u in nodes for v in nodes if u != v and rng.random() < 0.15}
+        index = ReachabilityIndex(nodes, sorted(edges))
+        _check(index, nodes, edges)
+        for _ in range(8):
+            action = rng.random()
+            if action < 0.45:
+                u, v = rng.sample(nodes, 2) if len(nodes) > 1 else (nodes[0], "extra")
+                nodes += [n for n in (u, v) if n not in nodes]
+                edges.add((u, v))
+                index.add_edge(u, v)
+            elif action < 0.8 and edges:
+                u, v = rng.choice(sorted(edges))
+                edges.discard((u, v))
+                index.remove_edge(u, v)
+            elif len(nodes) > 1:
+                node = rng.choice(nodes)
+                nodes.remove(node)
+                edges = {(u, v) for u, v in edges if node not in (u, v)}
+                index.remove_node(node)
+            _check(index, nodes, edges)
@@ -0,0 +1,30 @@
+# tests/test_segmenter.py
+
+import re
+from patent_core.segmenter import iter_segments, remove_parenthesized_text
+
+
+def _two_pass(claim):
+    # The original implementation the single pass must match
+    return re.sub(r"\s+", " ", re.sub(r"\([^)]*\)", "", claim)).strip()
+
+
+def test_remove_parenthesized_text_matches_two_pass():
+    for claim in [
+        "a valve (3) body",
+        "valve(3) (4)body",
+        "valve(3)(4)body",
+        " (1) a  lever\t(2)\n",
+        "a (first ) arm",
+        "no parentheses at all",
+        "",
+    ]:
+        assert remove_parenthesized_text(claim) == _two_pass(claim)
+
+
+def test_iter_segments_offsets_point_into_text():
+    text = "A device comprising: a housing; a lever, wherein the lever pivots; " * 200
+    segments = list(iter_segments(text, max_chars=500))
+    assert all(len(segment) <= 500 for segment, _ in segments)
+    for segment, offset in segments:
+        assert text[offset:offset + len(segment)] == segment
@@ -0,0 +1,68 @@
+# tests/test_storage.py
+
+import json
+import os
+import pytest
+from patent_core.snapshot import SCHEMA_VERSION, SnapshotError, dumps_snapshot, loads_snapshot
+from patent_core.storage import file_stamp, load_summary, merge_sections, save_summary, section_digests, snapshot_path
+
+
+def _summary(tmp_path, data):
+    json_path = tmp_path / "EP1" / "Summary_EP1.json"
+    json_path.parent.mkdir()
+    save_summary(json_path, data, force=True)
+    return json_path
+
+
+def test_snapshot_used_only_for_the_json_it_was_written_from(tmp_path):
+    json_path = _summary(tmp_path, {"Ptbs": "old"})
+    assert load_summary(json_path) == {"Ptbs": "old", "Revision": 1}
+
+    # Restored JSON with an older mtime than the snapshot (cp -p, rsync, unzip)
+    snap_mtime = os.stat(snapshot_path(json_path)).st_mtime_ns
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"Ptbs": "restored", "Revision": 7}, f)
+    os.utime(json_path, ns=(snap_mtime - 10**9, snap_mtime - 10**9))
+    assert load_summary(json_path, ["Ptbs"]) == {"Ptbs": "restored"}
+
+
+def test_snapshot_of_another_schema_is_not_decoded(tmp_path):
+    json_path = _summary(tmp_path, {"Ptbs": "current"})
+    with open(snapshot_path(json_path), "wb") as f:
+        f.write(dumps_snapshot({"Ptbs": "future"}, schema_version=SCHEMA_VERSION + 1, source_stamp=file_stamp(json_path)))
+    with pytest.raises(SnapshotError):
+        loads_snapshot(snapshot_path(json_path).read_bytes())
+    assert load_summary(json_path, ["Ptbs"]) == {"Ptbs": "current"}
+
+
+def test_merge_without_base_keeps_sections_only_on_disk(tmp_path):
+    merged, conflicts = merge_sections({"Ptbs": "mine"}, {"Ptbs": "theirs", "Markers": ["A"]})
+    assert merged == {"Ptbs": "mine", "Markers": ["A"]} and conflicts == []
+
+    json_path = _summary(tmp_path, {"Ptbs": "theirs", "Markers": ["A"]})
+    saved, _ = save_summary(json_path, {"Ptbs": "mine"})
+    assert saved == {"Ptbs": "mine", "Markers": ["A"], "Revision": 2}
+
+
+def test_merge_takes_sections_changed_on_one_side():
+    base = section_digests({"Ptbs": "p", "Markers": ["A"]})
+    merged, conflicts = merge_sections({"Ptbs": "mine", "Markers": ["A"]}, {"Ptbs": "p", "Markers": ["B"]}, base)
+    assert merged == {"Ptbs": "mine", "Markers": ["B"]} and conflicts == []
+
+
+def test_merge_reports_sections_changed_on_both_sides():
+    base = section_digests({"Ptbs": "p", "Markers": ["A"]})
+    merged, conflicts = merge_sections({"Ptbs": "mine", "Markers": ["A"]}, {"Ptbs": "theirs", "Markers": ["A"]}, base)
+    assert conflicts == ["Ptbs"]
+    # Both sides making the same change is not a conflict
+    _, conflicts = merge_sections({"Ptbs": "same"}, {"Ptbs": "same"}, section_digests({"Ptbs": "p"}))
+    assert conflicts == []
+
+
+def test_merge_keeps_deletions_from_either_side():
+    base = section_digests({"Ptbs": "p", "Markers": ["A"], "Network": {}})
+    merged, conflicts = merge_sections({"Ptbs": "p", "Network": {}}, {"Ptbs": "p", "Markers": ["A"]}, base)
+    assert merged == {"Ptbs": "p"} and conflicts == []
+    # Deleted on one side, edited on the other
+    _, conflicts = merge_sections({"Ptbs": "p"}, {"Ptbs": "p", "Markers": ["B"]}, base)
+    assert conflicts == ["Markers"]
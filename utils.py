@@ -2,29 +2,17 @@
 
 import json
 import io
-import re
-import unicodedata
 import streamlit as st
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
+from patent_core.snapshot import dumps_snapshot, loads_snapshot
+from patent_core.paths import secure_filename
 
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 APP_FOLDER_NAME = "PatentAppData"
 
-# ✅ Secure filename generator
-def secure_filename(value: str, allow_uuid_suffix: bool = False) -> str:
-    import uuid
-    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
-    value = re.sub(r"[^\w.\- ]", "", value)
-    value = re.sub(r"\s+", "_", value).strip("._")
-    if not value:
-        value = "file"
-    if allow_uuid_suffix:
-        value += f"_{uuid.uuid4().hex[:6]}"
-    return value
-
 @st.cache_resource(show_spinner="🔐 Authenticating with Google Drive...")
 def authenticate():
     secrets = st.secrets["gcp_oauth"]
@@ -60,64 +48,80 @@ def get_or_create_folder(service):
     folder = service.files().create(body=file_metadata, fields='id').execute()
     return folder['id']
 
-def upload_json_to_drive(filename, data):
+def download_json_from_drive(filename):
     filename = secure_filename(filename)
-    if not isinstance(data, dict) or not data:
-        st.error("❌ Cannot upload empty or invalid JSON data.")
-        return
-
     service = authenticate()
     folder_id = get_or_create_folder(service)
-    json_str = json.dumps(data, indent=4, ensure_ascii=False)
-    bytes_io = io.BytesIO(json_str.encode('utf-8'))
-
     results = service.files().list(
         q=f"name='Summary_{filename}.json' and '{folder_id}' in parents and trashed=false",
         spaces='drive',
         fields='files(id, name)'
     ).execute()
     items = results.get('files', [])
+    if not items:
+        return {}
 
-    if items:
-        file_id = items[0]['id']
-        service.files().update(
-            fileId=file_id,
-            media_body=MediaIoBaseUpload(bytes_io, mimetype='application/json', resumable=True)
-        ).execute()
-    else:
-        metadata = {'name': f"Summary_{filename}.json", 'parents': [folder_id]}
-        service.files().create(
-            body=metadata,
-            media_body=MediaIoBaseUpload(bytes_io, mimetype='application/json', resumable=True),
-            fields='id'
-        ).execute()
+    file_id = items[0]['id']
+    request = service.files().get_media(fileId=file_id)
+    fh = io.BytesIO()
+    downloader = MediaIoBaseDownload(fh, request)
+    done = False
+    while not done:
+        _, done = downloader.next_chunk()
+    fh.seek(0)
+    return json.load(fh)
 
-def download_json_from_drive(filename):
-    filename = secure_filename(filename)
-    service = authenticate()
-    folder_id = get_or_create_folder(service)
+def _find_drive_file(service, folder_id, name):
     results = service.files().list(
-        q=f"name='Summary_{filename}.json' and '{folder_id}' in parents and trashed=false",
+        q=f"name='{name}' and '{folder_id}' in parents and trashed=false",
         spaces='drive',
         fields='files(id, name)'
     ).execute()
     items = results.get('files', [])
-    if not items:
-        return {}
+    return items[0]['id'] if items else None
+
+def upload_snapshot_to_drive(filename, data):
+    filename = secure_filename(filename)
+    if not isinstance(data, dict) or not data:
+        st.error("❌ Cannot upload empty or invalid summary data.")
+        return
+
+    service = authenticate()
+    folder_id = get_or_create_folder(service)
+    name = f"Summary_{filename}.snap"
+    bytes_io = io.BytesIO(dumps_snapshot(data))
+    media = MediaIoBaseUpload(bytes_io, mimetype='application/octet-stream', resumable=True)
+
+    file_id = _find_drive_file(service, folder_id, name)
+    if file_id:
+        service.files().update(fileId=file_id, media_body=media).execute()
+    else:
+        metadata = {'name': name, 'parents': [folder_id]}
+        service.files().create(body=metadata, media_body=media, fields='id').execute()
+
+def download_snapshot_from_drive(filename):
+    filename = secure_filename(filename)
+    service = authenticate()
+    folder_id = get_or_create_folder(service)
+    file_id = _find_drive_file(service, folder_id, f"Summary_{filename}.snap")
+    if not file_id:
+        return None
 
-    file_id = items[0]['id']
     request = service.files().get_media(fileId=file_id)
     fh = io.BytesIO()
     downloader = MediaIoBaseDownload(fh, request)
     done = False
     while not done:
         _, done = downloader.next_chunk()
-    fh.seek(0)
-    return json.load(fh)
+    return loads_snapshot(fh.getbuffer())
 
 # Final aliases for app.py
+# Summaries are transferred as compressed snapshots; JSON is still read for older backups
 def backup_to_drive(filename, data):
-    upload_json_to_drive(filename, data)
+    upload_snapshot_to_drive(filename, data)
 
 def load_from_drive(filename):
-    return download_json_from_drive(filename)
+    data = download_snapshot_from_drive(filename)
+    if data is None:
+        data = download_json_from_drive(filename)
+    return data